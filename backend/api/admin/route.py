@@ -0,0 +1,84 @@
+# api/admin/route.py
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from utils.admin import is_admin_token
+from utils.logger import get_logger
+from utils.middleware.admission_middleware import admission_controller
+from utils.profiling.profile_store import profile_store
+from utils.resilience.dependency import DEPENDENCIES
+from utils.responses import FastJSONResponse
+
+logger = get_logger(__name__)
+
+
+async def require_admin(x_admin_token: str = Header(default="")) -> None:
+    """Reject requests without a valid X-Admin-Token header."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required",
+        )
+
+
+admin_router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@admin_router.get("/metrics", response_class=FastJSONResponse)
+async def metrics() -> FastJSONResponse:
+    """
+    Resilience state of this worker.
+
+    Circuit breaker state and bulkhead usage per dependency, and the
+    admission controller's queue. Each worker keeps its own state.
+    """
+    return FastJSONResponse(
+        {
+            "dependencies": {
+                name: dependency.snapshot() for name, dependency in DEPENDENCIES.items()
+            },
+            "admission": admission_controller.snapshot(),
+        }
+    )
+
+
+@admin_router.get("/profiles", response_class=FastJSONResponse)
+async def list_profiles(limit: int = 50) -> FastJSONResponse:
+    """Most recent request profiles, newest first."""
+    return FastJSONResponse(
+        {"profiles": await asyncio.to_thread(profile_store.recent, limit)}
+    )
+
+
+@admin_router.get(
+    "/profiles/{request_id}",
+    responses={
+        200: {"content": {"application/json": {}}, "description": "Speedscope profile"},
+        404: {"description": "No profile for this request ID"},
+    },
+)
+async def get_profile(request_id: str) -> Response:
+    """
+    Speedscope profile of one request, by the ID from its X-Profile-Id header.
+
+    Open the downloaded file at https://www.speedscope.app.
+    """
+    profile = await asyncio.to_thread(profile_store.load, request_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No profile for request {request_id}",
+        )
+
+    return Response(
+        content=profile,
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="{request_id}.speedscope.json"'
+        },
+    )
@@ -1,9 +1,7 @@
 # api/auth/routes.py
-from datetime import timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Header, HTTPException, Request, Response, status
-from firebase_admin import auth
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from api.auth.schema import (
     ErrorResponse,
@@ -11,10 +9,12 @@ from api.auth.schema import (
     UserResponse,
     WhoAmIResponse,
 )
-from api.auth.service import AuthError, create_or_get_user, format_user_response
+from api.auth.service import AuthError, format_user_response, login_user
 from settings import settings
-from utils.firebase.firebase_manager import FirebaseTokenError, firebase_manager
+from utils.auth_context import AuthContext, get_auth_context
+from utils.firebase.firebase_manager import FirebaseTokenError
 from utils.logger import get_logger
+from utils.resilience.dependency import DependencyUnavailableError
 
 logger = get_logger(__name__)
 
@@ -35,6 +35,8 @@ auth_router = APIRouter(prefix="/api/auth", tags=["auth"])
     responses={
         401: {"model": ErrorResponse, "description": "Missing or invalid credentials"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Firebase or MongoDB unavailable"},
+        504: {"model": ErrorResponse, "description": "Login timed out"},
     },
 )
 async def init_user(
@@ -49,9 +51,9 @@ async def init_user(
 
     Actions:
     1. Verifies Firebase ID token.
-    2. Creates Firebase session cookie.
-    3. Creates or updates user in MongoDB.
-    4. Returns success and sets cookie.
+    2. Creates Firebase session cookie and creates or updates the user in
+       MongoDB, concurrently.
+    3. Returns success and sets cookie.
     """
     try:
         logger.info("Init user endpoint called")
@@ -64,15 +66,7 @@ async def init_user(
 
         id_token = authorization.split("Bearer ")[1]
         logger.info("Verifying Firebase ID token")
-        user_info = await firebase_manager.verify_firebase_id_token(id_token)
-
-        # Create Firebase session cookie (14 days)
-        expires_in = timedelta(days=14)
-        session_cookie = auth.create_session_cookie(id_token, expires_in=expires_in)
-        logger.info("Firebase session cookie created")
-
-        # Create or update user in DB
-        user_doc = await create_or_get_user(user_info)
+        session_cookie, user_doc = await login_user(id_token)
         formatted_user = format_user_response(user_doc)
 
         cookie_cfg = settings.cookie_settings
@@ -99,6 +93,18 @@ async def init_user(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
+    except DependencyUnavailableError as e:
+        logger.warning(f"Login rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service temporarily unavailable",
+            headers={"Retry-After": e.retry_after_header},
+        )
+    except TimeoutError:
+        logger.error("Login pipeline timed out")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Login timed out"
+        )
     except Exception as e:
         logger.error(f"Unexpected error in init_user: {e}", exc_info=True)
         raise HTTPException(
@@ -110,47 +116,27 @@ async def init_user(
 @auth_router.get(
     "/who-am-i",
     response_model=WhoAmIResponse,
-    responses={401: {"model": ErrorResponse, "description": "Unauthorized"}},
+    responses={
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        503: {"model": ErrorResponse, "description": "Firebase unavailable"},
+    },
 )
-async def who_am_i(request: Request) -> WhoAmIResponse:
-    """
-    Identify the currently authenticated user via session cookie.
+async def who_am_i(
+    auth: AuthContext = Depends(get_auth_context),
+) -> WhoAmIResponse:
     """
-    try:
-        session_cookie = request.cookies.get("session")
-        if not session_cookie:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="No session cookie"
-            )
-
-        user_info = await firebase_manager.verify_firebase_session_cookie(
-            session_cookie
-        )
-        firebase_uid = user_info["uid"]
-        email = user_info["email"]
-        name = user_info.get("name", "")
-        picture = user_info.get("picture", "")
-
-        return WhoAmIResponse(
-            success=True,
-            firebase_uid=firebase_uid,
-            email=email,
-            name=name,
-            picture=picture,
-        )
+    Identify the currently authenticated user.
 
-    except FirebaseTokenError as e:
-        logger.warning(f"Invalid session cookie: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired session",
-        )
-    except Exception as e:
-        logger.error(f"Error in who_am_i: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error",
-        )
+    The session cookie was already verified by AuthMiddleware; this only
+    reads the request's auth context.
+    """
+    return WhoAmIResponse(
+        success=True,
+        firebase_uid=auth.uid,
+        email=auth.email,
+        name=auth.name,
+        picture=auth.picture,
+    )
 
 
 @auth_router.post(
@@ -1,9 +1,12 @@
-from datetime import UTC, datetime
+import asyncio
+from datetime import UTC, datetime, timedelta
 
 from settings import settings
 from utils.firebase.firebase_manager import firebase_manager
 from utils.logger import get_logger
 from utils.mongo.mongo_manager import db
+from utils.mongo.write_behind import activity_buffer
+from utils.resilience.dependency import DependencyUnavailableError, mongo_dependency
 
 logger = get_logger(__name__)
 
@@ -14,7 +17,68 @@ class AuthError(Exception):
     pass
 
 
+# Session cookie lifetime (Firebase allows at most 14 days)
+SESSION_EXPIRES_IN = timedelta(days=14)
+
+
+async def login_user(id_token: str) -> tuple[str, dict]:
+    """
+    Run the login pipeline for a Firebase ID token.
+
+    Flow:
+    1. Verify the ID token
+    2. Concurrently, in worker threads:
+       - mint the Firebase session cookie
+       - create or update the user in MongoDB
+    3. Return both
+
+    Steps 2a and 2b are independent once the token is verified, so login
+    latency is max(cookie, upsert) instead of their sum. The whole pipeline
+    shares one LOGIN_TIMEOUT deadline. If either step fails or the deadline
+    passes, the other is cancelled (a thread that already started runs to
+    completion but its result is discarded).
+
+    Args:
+        id_token: Firebase ID token
+
+    Returns:
+        Tuple of (session cookie, user document)
+
+    Raises:
+        FirebaseTokenError: If token verification fails
+        AuthError: If MongoDB operations fail
+        DependencyUnavailableError: If Firebase or MongoDB calls are being shed
+        TimeoutError: If the pipeline exceeds LOGIN_TIMEOUT
+    """
+    async with asyncio.timeout(settings.LOGIN_TIMEOUT):
+        user_info = await firebase_manager.verify_firebase_id_token(id_token)
+
+        cookie_task = asyncio.create_task(
+            firebase_manager.create_session_cookie(
+                id_token, expires_in=SESSION_EXPIRES_IN
+            )
+        )
+        user_task = asyncio.create_task(create_or_get_user(user_info))
+        try:
+            session_cookie, user_doc = await asyncio.gather(cookie_task, user_task)
+        except BaseException:
+            cookie_task.cancel()
+            user_task.cancel()
+            raise
+
+    return session_cookie, user_doc
+
+
 async def create_or_get_user(user_info: dict) -> dict:
+    """
+    Create/get user from MongoDB without blocking the event loop.
+
+    See _create_or_get_user.
+    """
+    return await asyncio.to_thread(_create_or_get_user, user_info)
+
+
+def _create_or_get_user(user_info: dict) -> dict:
     """
     Verify Firebase token and create/get user from MongoDB.
 
@@ -22,7 +86,7 @@ async def create_or_get_user(user_info: dict) -> dict:
     1. Verify Firebase session cookie and extract user info
     2. Check if user exists in MongoDB
     3. If new user → Create with initial data
-    4. If existing user → Update last_login
+    4. If existing user → Update last_login (buffered, see ActivityBuffer)
     5. Return user data
 
     Args:
@@ -45,47 +109,61 @@ async def create_or_get_user(user_info: dict) -> dict:
     logger.info(f"Token verified for user: {email}")
 
     try:
-        # Step 2 & 3 & 4: Check if user exists and create/update
-        db_instance = db.get_db()
-        user_collection = db_instance[settings.USER_COLLECTION]
-
-        existing_user = user_collection.find_one({"firebase_uid": firebase_uid})
-
-        if existing_user:
-            # User exists - update last_login
-            logger.info(f"User exists: {email}. Updating last_login...")
-            user_collection.update_one(
-                {"firebase_uid": firebase_uid},
-                {
-                    "$set": {
-                        "last_login": datetime.now(UTC),
-                    }
-                },
-            )
-            # Fetch updated user
-            updated_user = user_collection.find_one({"firebase_uid": firebase_uid})
-            logger.info(f"User {email} updated successfully")
-            return updated_user
-
-        else:
-            # New user - create
-            logger.info(f"Creating new user: {email}...")
-            new_user = {
-                "firebase_uid": firebase_uid,
-                "email": email,
-                "name": name,
-                "profile_picture": picture,
-                "coins": settings.INITIAL_COIN,
-                "created_at": datetime.now(UTC),
-                "coin_updated_at": datetime.now(UTC),
-                "last_login": datetime.now(UTC),
-            }
-            result = user_collection.insert_one(new_user)
-            new_user["_id"] = result.inserted_id
-            logger.info(
-                f"New user created successfully: {email} (ID: {result.inserted_id})"
-            )
-            return new_user
+        with mongo_dependency.call():
+            # Step 2 & 3 & 4: Check if user exists and create/update
+            db_instance = db.get_db()
+            user_collection = db_instance[settings.USER_COLLECTION]
+
+            existing_user = user_collection.find_one({"firebase_uid": firebase_uid})
+
+            if existing_user and activity_buffer.enabled:
+                # User exists - buffer last_login; repeated logins coalesce
+                now = datetime.now(UTC)
+                activity_buffer.record(
+                    settings.USER_COLLECTION, firebase_uid, "last_login", now
+                )
+                existing_user["last_login"] = now
+                logger.info(f"User exists: {email}. last_login buffered")
+                return existing_user
+
+            elif existing_user:
+                # User exists - update last_login
+                logger.info(f"User exists: {email}. Updating last_login...")
+                user_collection.update_one(
+                    {"firebase_uid": firebase_uid},
+                    {
+                        "$set": {
+                            "last_login": datetime.now(UTC),
+                        }
+                    },
+                )
+                # Fetch updated user
+                updated_user = user_collection.find_one({"firebase_uid": firebase_uid})
+                logger.info(f"User {email} updated successfully")
+                return updated_user
+
+            else:
+                # New user - create
+                logger.info(f"Creating new user: {email}...")
+                new_user = {
+                    "firebase_uid": firebase_uid,
+                    "email": email,
+                    "name": name,
+                    "profile_picture": picture,
+                    "coins": settings.INITIAL_COIN,
+                    "created_at": datetime.now(UTC),
+                    "coin_updated_at": datetime.now(UTC),
+                    "last_login": datetime.now(UTC),
+                }
+                result = user_collection.insert_one(new_user)
+                new_user["_id"] = result.inserted_id
+                logger.info(
+                    f"New user created successfully: {email} (ID: {result.inserted_id})"
+                )
+                return new_user
+
+    except DependencyUnavailableError:
+        raise
 
     except Exception as e:
         # Only catch MongoDB and other unexpected errors here
@@ -0,0 +1,74 @@
+# api/progress/route.py
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Request, Response, WebSocket, status
+from fastapi.responses import StreamingResponse
+
+from api.progress.service import progress_stream_finished, stream_progress_events
+from utils.auth_context import AuthContext, get_auth_context
+from utils.logger import get_logger
+from utils.websocket.connection_manager import connection_manager
+
+logger = get_logger(__name__)
+
+progress_router = APIRouter(prefix="/api/progress", tags=["progress"])
+
+# Redis stream entry IDs look like "1718030000000-0"
+STREAM_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+@progress_router.websocket("/ws")
+async def progress_websocket(websocket: WebSocket) -> None:
+    """
+    Push channel for task progress and new results.
+
+    The handshake is authenticated with the same Firebase session cookie as
+    the HTTP routes (WebSockets bypass AuthMiddleware). Every message is a
+    JSON object with a `type` field; several pending messages may arrive
+    together as `{"type": "batch", "messages": [...]}`.
+    """
+    conn = await connection_manager.connect(websocket)
+    if conn is None:
+        return
+
+    await connection_manager.serve(conn)
+
+
+@progress_router.get(
+    "/{task_id}/events",
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Progress events"},
+        204: {"description": "Stream already ended with a terminal status"},
+    },
+)
+async def progress_events(
+    task_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    auth: AuthContext = Depends(get_auth_context),
+) -> Response:
+    """
+    Server-Sent Events fallback for clients whose proxies break WebSockets.
+
+    Sends the same progress messages as the WebSocket channel, each with
+    its `id` as the SSE event ID. Browsers reconnect with Last-Event-ID and
+    only receive the events they missed; once they have the terminal event
+    the reconnect gets 204, which makes EventSource stop.
+    """
+    user_id = auth.uid
+
+    if last_event_id is not None and not STREAM_ID_PATTERN.match(last_event_id):
+        logger.warning(f"Ignoring malformed Last-Event-ID: {last_event_id}")
+        last_event_id = None
+
+    if await progress_stream_finished(user_id, task_id, last_event_id):
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    return StreamingResponse(
+        stream_progress_events(
+            user_id, task_id, last_event_id, request.is_disconnected
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,244 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from settings import settings
+from utils.logger import get_logger
+from utils.redis.redis_manager import redis_manager
+from utils.responses import dumps
+from utils.websocket.connection_manager import connection_manager
+
+logger = get_logger(__name__)
+
+# A progress event with one of these statuses ends the task's event stream
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def _stream_key(uid: str, task_id: str) -> str:
+    # Keyed by uid too, so a user can only ever read their own tasks' events
+    return f"progress:{uid}:{task_id}"
+
+
+async def publish_progress(uid: str, task_id: str, event: dict[str, Any]) -> str:
+    """
+    Publish a progress event to the task owner's WebSocket and SSE clients.
+
+    The event is appended to a short, capped Redis stream for the task
+    (so SSE clients can resume with Last-Event-ID) and pushed over the
+    WebSocket channel. Both channels deliver the same message:
+
+        {"type": "progress", "id": "<stream id>", "task_id": "...", **event}
+
+    Args:
+        uid: Firebase UID of the task owner
+        task_id: Task identifier
+        event: Progress fields, e.g. {"status": "running", "progress": 40}
+
+    Returns:
+        The Redis stream ID of the event
+    """
+    key = _stream_key(uid, task_id)
+    client = redis_manager.get_client()
+
+    message = {"type": "progress", "task_id": task_id, **event}
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.xadd(
+            key,
+            {"event": dumps(message).decode("utf-8")},
+            maxlen=settings.PROGRESS_STREAM_MAXLEN,
+            approximate=True,
+        )
+        pipe.expire(key, settings.PROGRESS_STREAM_TTL)
+        event_id, _ = await pipe.execute()
+
+    message["id"] = event_id
+    await connection_manager.send_to_user(uid, message, key=f"progress:{task_id}")
+    return event_id
+
+
+def _to_sse(event_id: str, stored: str) -> tuple[bytes, bool]:
+    """Format a stored event as an SSE frame; also report whether it is terminal."""
+    message = json.loads(stored)
+    message["id"] = event_id
+    frame = b"id: %s\nevent: progress\ndata: %s\n\n" % (
+        event_id.encode("utf-8"),
+        dumps(message),
+    )
+    return frame, message.get("status") in TERMINAL_STATUSES
+
+
+def _stream_id(event_id: str) -> tuple[int, int]:
+    """Redis stream IDs ("<ms>-<seq>") as a comparable tuple."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+# Queue item: (event id, SSE frame, terminal), or None when the reader stops
+ProgressItem = Optional[tuple[str, bytes, bool]]
+
+
+class ProgressReaders:
+    """
+    One blocking XREAD per task, shared by every SSE client of this worker.
+
+    Each reader holds a single pooled Redis connection however many clients
+    watch the task, and fans the events out to their in-memory queues. It
+    stops after a terminal status, or once its last client has left.
+    """
+
+    def __init__(self, queue_size: int = 2 * settings.PROGRESS_STREAM_MAXLEN) -> None:
+        self.queue_size = queue_size
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        # Running readers, referenced until they finish
+        self._readers: set[asyncio.Task] = set()
+
+    def subscribe(self, key: str) -> asyncio.Queue:
+        """Register a client for a task's stream and return the queue it reads from."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        queues = self._queues.get(key)
+        if queues is None:
+            queues = self._queues[key] = set()
+            reader = asyncio.create_task(self._read(key, queues))
+            self._readers.add(reader)
+            reader.add_done_callback(self._readers.discard)
+        queues.add(queue)
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue) -> None:
+        # The reader notices the empty set after its current XREAD returns
+        queues = self._queues.get(key)
+        if queues is not None:
+            queues.discard(queue)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item: ProgressItem) -> bool:
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _close(self, queue: asyncio.Queue) -> None:
+        """Tell a client to end its stream, dropping an event to make room."""
+        if not self._put(queue, None):
+            queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def _read(self, key: str, queues: set[asyncio.Queue]) -> None:
+        client = redis_manager.get_client()
+        block_ms = settings.SSE_HEARTBEAT_INTERVAL * 1000
+        # From the start of the (capped) stream, so no client's catch-up
+        # read can miss an event; clients skip the ones they already sent
+        last_event_id = "0-0"
+        try:
+            while queues:
+                response = await client.xread({key: last_event_id}, block=block_ms)
+                if not response:
+                    continue
+
+                for event_id, fields in response[0][1]:
+                    last_event_id = event_id
+                    frame, terminal = _to_sse(event_id, fields["event"])
+                    for queue in list(queues):
+                        if not self._put(queue, (event_id, frame, terminal)):
+                            # Slow client: it reconnects with Last-Event-ID
+                            logger.warning(f"Closing slow progress stream on {key}")
+                            queues.discard(queue)
+                            self._close(queue)
+                    if terminal:
+                        return
+
+        except Exception as e:
+            logger.error(f"Progress stream reader failed on {key}: {e}", exc_info=True)
+
+        finally:
+            if self._queues.get(key) is queues:
+                del self._queues[key]
+            for queue in queues:
+                self._close(queue)
+
+
+progress_readers = ProgressReaders()
+
+
+async def progress_stream_finished(
+    uid: str, task_id: str, last_event_id: Optional[str]
+) -> bool:
+    """
+    True if a reconnecting client has already received the terminal event.
+
+    Also true once the task's stream has expired, so a browser EventSource
+    stops reconnecting (the route answers 204) instead of getting heartbeats.
+    """
+    if last_event_id is None:
+        return False
+
+    latest = await redis_manager.get_client().xrevrange(
+        _stream_key(uid, task_id), count=1
+    )
+    if not latest:
+        return True
+
+    event_id, fields = latest[0]
+    _, terminal = _to_sse(event_id, fields["event"])
+    return terminal and _stream_id(event_id) <= _stream_id(last_event_id)
+
+
+async def stream_progress_events(
+    uid: str,
+    task_id: str,
+    last_event_id: Optional[str],
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    """
+    Yield a task's progress events as Server-Sent Events.
+
+    A fresh connection starts from the latest event only; a reconnect with
+    Last-Event-ID gets just the events it missed. Live events come from the
+    task's shared reader (ProgressReaders). Idle periods produce a
+    heartbeat comment. The stream ends after a terminal status.
+    """
+    key = _stream_key(uid, task_id)
+    client = redis_manager.get_client()
+
+    # Subscribe before catching up, so no event falls in between
+    queue = progress_readers.subscribe(key)
+    try:
+        if last_event_id is None:
+            backlog = await client.xrevrange(key, count=1)
+            last_event_id = "0-0"
+        else:
+            backlog = await client.xrange(key, min=last_event_id)
+
+        for event_id, fields in backlog:
+            if _stream_id(event_id) <= _stream_id(last_event_id):
+                continue
+            last_event_id = event_id
+            frame, terminal = _to_sse(event_id, fields["event"])
+            yield frame
+            if terminal:
+                return
+
+        while not await is_disconnected():
+            try:
+                item = await asyncio.wait_for(
+                    queue.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+
+            if item is None:
+                # Reader stopped or dropped us; the browser reconnects
+                return
+
+            event_id, frame, terminal = item
+            if _stream_id(event_id) <= _stream_id(last_event_id):
+                continue
+            last_event_id = event_id
+            yield frame
+            if terminal:
+                return
+
+    finally:
+        progress_readers.unsubscribe(key, queue)
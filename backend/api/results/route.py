@@ -0,0 +1,194 @@
+# api/results/route.py
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from api.results.schema import (
+    ResultListResponse,
+    ResultResponse,
+    ResultStatsResponse,
+    ServiceResultStats,
+)
+from settings import settings
+from utils.auth_context import AuthContext, get_auth_context
+from utils.http_cache import is_not_modified, not_modified_response, results_etag
+from utils.logger import get_logger
+from utils.mongo.change_stream import result_change_stream
+from utils.mongo.mongo_manager import db
+from utils.responses import ModelJSONResponse, RawResultResponse, dumps
+
+logger = get_logger(__name__)
+
+results_router = APIRouter(prefix="/api/results", tags=["results"])
+
+
+@results_router.get(
+    "/stream",
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Result events"},
+        503: {"description": "Result streaming is disabled"},
+    },
+)
+async def stream_results(
+    request: Request,
+    auth: AuthContext = Depends(get_auth_context),
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of the current user's newly stored results.
+
+    Each event carries the same fields as a ResultSummary. Replaces
+    polling GET /api/results for new results.
+    """
+    if not settings.RESULT_CHANGE_STREAM_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Result streaming is disabled",
+        )
+
+    user_id = auth.uid
+
+    async def event_stream():
+        queue = result_change_stream.subscribe(user_id)
+        logger.info(f"Result stream opened for user {user_id}")
+        try:
+            while not await request.is_disconnected():
+                try:
+                    result = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line so proxies don't close an idle stream
+                    yield b": heartbeat\n\n"
+                    continue
+                yield b"event: result\ndata: " + dumps(result) + b"\n\n"
+        finally:
+            result_change_stream.unsubscribe(user_id, queue)
+            logger.info(f"Result stream closed for user {user_id}")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@results_router.get("/stats", response_model=ResultStatsResponse)
+async def result_stats(
+    auth: AuthContext = Depends(get_auth_context),
+) -> ResultStatsResponse:
+    """
+    Result count, last activity and token usage of the current user, per service.
+
+    Only services the user has results for are listed, newest activity first.
+    """
+    user_id = auth.uid
+
+    aggregates = await asyncio.to_thread(db.get_result_aggregates, user_id)
+    if aggregates is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load result stats",
+        )
+
+    return ResultStatsResponse(
+        services=[
+            ServiceResultStats(service=service, **stats)
+            for service, stats in aggregates.items()
+        ]
+    )
+
+
+@results_router.get(
+    "",
+    response_model=ResultListResponse,
+    responses={304: {"description": "Results unchanged since the given ETag"}},
+)
+async def list_results(
+    request: Request,
+    service: Optional[str] = None,
+    auth: AuthContext = Depends(get_auth_context),
+) -> Response:
+    """
+    Summaries of the current user's results, newest first.
+
+    Answers 304 when If-None-Match still matches, without reading any
+    result document. Archived results are not listed.
+    """
+    user_id = auth.uid
+
+    etag = await asyncio.to_thread(results_etag, user_id, service=service)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    if service is None:
+        docs = await asyncio.to_thread(
+            db.find_all_results_by_user, user_id, settings.RESULT_COLLECTION
+        )
+    else:
+        docs = await asyncio.to_thread(
+            db.find_all_results_by_service,
+            user_id,
+            service,
+            settings.RESULT_COLLECTION,
+        )
+    if docs is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load results",
+        )
+
+    response = ModelJSONResponse(ResultListResponse(results=docs))
+    if etag is not None:
+        response.headers["etag"] = etag
+    return response
+
+
+@results_router.get(
+    "/{task_id}",
+    response_model=ResultResponse,
+    responses={
+        304: {"description": "Result unchanged since the given ETag"},
+        404: {"description": "Result not found"},
+        422: {"description": "task_id is not a valid UUID"},
+    },
+)
+async def get_result(
+    task_id: UUID,
+    request: Request,
+    auth: AuthContext = Depends(get_auth_context),
+) -> Response:
+    """
+    One result of the current user, with its response data.
+
+    The document is serialized straight from raw BSON (see
+    utils.responses.RawResultResponse). Answers 304 when If-None-Match
+    still matches. A task_id that is not a UUID is rejected with 422
+    before MongoDB is queried, as TaskResultQuery does.
+    """
+    user_id = auth.uid
+    # Canonical form, as task IDs are stored
+    result_task_id = str(task_id)
+
+    etag = await asyncio.to_thread(results_etag, user_id, task_id=result_task_id)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    doc = await asyncio.to_thread(
+        db.find_raw_result_by_task,
+        user_id,
+        result_task_id,
+        settings.RESULT_COLLECTION,
+    )
+    if doc is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Result not found",
+        )
+
+    response = RawResultResponse(doc)
+    if etag is not None:
+        response.headers["etag"] = etag
+    return response
@@ -0,0 +1,61 @@
+# api/results/schema.py
+
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class ResultSummary(BaseModel):
+    """One stored result, without its response data."""
+
+    user_id: str = Field(..., description="Owner's Firebase UID")
+    task_id: str = Field(..., description="Task identifier")
+    timestamp: str = Field(..., description="When the result was stored")
+    original_query: str = Field(..., description="Question the task answered")
+    service: str = Field(..., description="Service name")
+
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def convert_timestamp_to_iso_string(cls, v):
+        """Convert datetime to ISO format string."""
+        if isinstance(v, datetime):
+            return v.isoformat()
+        return v
+
+
+class ResultListResponse(BaseModel):
+    """Response schema for the /api/results listing endpoint."""
+
+    results: list[ResultSummary] = Field(default_factory=list)
+
+
+class ResultResponse(ResultSummary):
+    """Response schema for the /api/results/{task_id} endpoint."""
+
+    response: Optional[Any] = Field(default=None, description="Result data")
+
+
+class ServiceResultStats(BaseModel):
+    """Result count and last activity of one service."""
+
+    service: str = Field(..., description="Service name")
+    count: int = Field(default=0, description="Number of stored results")
+    latest_timestamp: Optional[str] = Field(
+        default=None, description="Timestamp of the newest result"
+    )
+    total_tokens: int = Field(default=0, description="Tokens used across all results")
+
+    @field_validator("latest_timestamp", mode="before")
+    @classmethod
+    def convert_timestamp_to_iso_string(cls, v):
+        """Convert datetime to ISO format string."""
+        if isinstance(v, datetime):
+            return v.isoformat()
+        return v
+
+
+class ResultStatsResponse(BaseModel):
+    """Response schema for the /api/results/stats endpoint."""
+
+    services: list[ServiceResultStats] = Field(default_factory=list)
@@ -7,17 +7,63 @@ Organizes all routes by functionality:
 - results: Retrieve task results
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from api.admin.route import admin_router
 from api.auth.route import auth_router
+from api.progress.route import progress_router
+from api.results.route import results_router
 from settings import settings
 from utils.logger import get_logger
+from utils.middleware.admission_middleware import AdmissionControlMiddleware
 from utils.middleware.auth_middleware import AuthMiddleware
+from utils.middleware.causal_middleware import CausalTokenMiddleware
+from utils.middleware.compression_middleware import CompressionMiddleware
+from utils.middleware.profiling_middleware import ProfilingMiddleware
+from utils.mongo.change_stream import result_change_stream
+from utils.mongo.mongo_manager import db
+from utils.mongo.write_behind import activity_buffer
+from utils.redis.redis_manager import redis_manager
+from utils.resilience.dependency import DependencyUnavailableError
+from utils.websocket.connection_manager import connection_manager
 
 logger = get_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-worker startup and shutdown.
+
+    Every worker builds its own Mongo client after it has started, so no
+    sockets are ever shared across a fork.
+    """
+    try:
+        db.ping()
+    except Exception as e:
+        # Don't refuse to boot; the client reconnects lazily on first use
+        logger.warning(f"MongoDB warm-up failed: {e}")
+
+    activity_buffer.start()
+    await connection_manager.start()
+    if settings.RESULT_CHANGE_STREAM_ENABLED:
+        result_change_stream.start()
+
+    yield
+
+    result_change_stream.stop()
+    # Sockets still open at this point get 1001 and reconnect elsewhere
+    await connection_manager.stop()
+    await redis_manager.close()
+    # Write out buffered last_login timestamps before the client goes away
+    await activity_buffer.stop()
+    db.close()
+
+
 def create_app() -> FastAPI:
     """
     Create and configure FastAPI application.
@@ -29,9 +75,26 @@ def create_app() -> FastAPI:
         title="Analysis API",
         description="FastAPI backend for analysis tasks",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
-    # Add CORS middleware
+    if settings.MONGO_SECONDARY_READS_ENABLED:
+        # Inside AuthMiddleware: only authenticated requests read results
+        app.add_middleware(CausalTokenMiddleware)
+
+    app.add_middleware(AuthMiddleware)
+
+    # Wraps AuthMiddleware, so profiles include session cookie verification
+    app.add_middleware(ProfilingMiddleware)
+
+    # Wraps AuthMiddleware, so 401s and every JSON body get compressed too
+    app.add_middleware(CompressionMiddleware)
+
+    # Before anything but CORS, so shed requests cost next to nothing
+    app.add_middleware(AdmissionControlMiddleware)
+
+    # Added last, so it is outermost: admission 503s and auth 401s carry
+    # the CORS headers too, and the browser lets the frontend read them
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
@@ -40,10 +103,23 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    app.add_middleware(AuthMiddleware)
+    @app.exception_handler(DependencyUnavailableError)
+    async def dependency_unavailable_handler(
+        request: Request, exc: DependencyUnavailableError
+    ) -> JSONResponse:
+        """Fast 503 when a circuit breaker or bulkhead rejects a call, or it times out."""
+        logger.warning(f"Dependency unavailable on {request.url.path}: {exc}")
+        return JSONResponse(
+            status_code=503,
+            content={"success": False, "message": "Service temporarily unavailable"},
+            headers={"Retry-After": exc.retry_after_header},
+        )
 
     # Register routers
     app.include_router(auth_router)
+    app.include_router(results_router)
+    app.include_router(progress_router)
+    app.include_router(admin_router)
 
     # Health check endpoint
     @app.get("/")
@@ -60,6 +136,7 @@ app = create_app()
 
 
 if __name__ == "__main__":
+    # Development server with auto-reload; use server.py in production
     import uvicorn
 
     uvicorn.run(
@@ -0,0 +1,32 @@
+"""
+Result archival job.
+
+Moves results older than RESULT_ARCHIVE_AFTER_DAYS from the results
+collection to RESULT_ARCHIVE_COLLECTION, and, if RESULT_PURGE_AFTER_DAYS
+is set, deletes archived results (and their offloaded payloads) older than
+that. Meant to run on a schedule (e.g. a daily cron job); it is safe to
+rerun after an interruption.
+
+Usage:
+    python archive_results.py
+"""
+
+from settings import settings
+from utils.logger import get_logger
+from utils.mongo.mongo_manager import db
+
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    store = db.get_payload_store()
+    try:
+        store.archive_results(settings.RESULT_ARCHIVE_AFTER_DAYS)
+        if settings.RESULT_PURGE_AFTER_DAYS is not None:
+            store.purge_archived_results(settings.RESULT_PURGE_AFTER_DAYS)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Serialization cost of results payloads, default FastAPI path vs fast path.
+
+Builds a results listing with task payloads of 10KB to 5MB (shaped like a
+stored LLM/Tavily output, including ObjectId and datetime values straight
+from MongoDB) and times:
+
+- default:  jsonable_encoder + json.dumps (what FastAPI does by default)
+- orjson:   FastJSONResponse on the raw documents
+- model:    ModelJSONResponse on the built response model
+
+Usage:
+    uv run python benchmarks/bench_json_responses.py
+"""
+
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field, field_validator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.responses import FastJSONResponse, ModelJSONResponse  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+OBJECT_ID = {ObjectId: str}
+
+
+class TaskResult(BaseModel):
+    # Mirrors app_types.TaskResult
+    user_id: str
+    task_id: str
+    timestamp: str
+    original_query: str
+    service: str
+    response: Optional[Any] = None
+
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def convert_timestamp_to_iso_string(cls, v):
+        if isinstance(v, datetime):
+            return v.isoformat()
+        return v
+
+
+class AllResultsResponse(BaseModel):
+    results: list[TaskResult] = Field(default_factory=list)
+
+
+def make_document(size: int) -> dict:
+    chunk = {
+        "title": "Some search result title",
+        "url": "https://example.com/article",
+        "content": "lorem ipsum dolor sit amet " * 20,
+        "score": 0.87,
+        "fetched_at": datetime.now(UTC),
+        "source_id": ObjectId(),
+    }
+    per_chunk = len(json.dumps(jsonable_encoder(chunk, custom_encoder=OBJECT_ID)))
+    return {
+        "_id": ObjectId(),
+        "user_id": "uid-123",
+        "task_id": "0b8e3c1a-6a57-4c0f-9d8f-0d1f7c1f3f1e",
+        "timestamp": datetime.now(UTC),
+        "original_query": "what is the weather",
+        "service": "search",
+        "response": {"results": [dict(chunk) for _ in range(size // per_chunk + 1)]},
+    }
+
+
+def default_path(docs: list[dict]) -> bytes:
+    # ObjectId has to be stringified up front before pydantic will accept it
+    results = jsonable_encoder(docs, custom_encoder=OBJECT_ID)
+    model = AllResultsResponse(results=results)
+    return json.dumps(jsonable_encoder(model)).encode("utf-8")
+
+
+def orjson_path(docs: list[dict]) -> bytes:
+    return FastJSONResponse({"results": docs}).body
+
+
+def model_path(docs: list[dict]) -> bytes:
+    return ModelJSONResponse(AllResultsResponse(results=docs)).body
+
+
+def peak_alloc(fn, docs) -> int:
+    tracemalloc.start()
+    fn(docs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    paths = {"default": default_path, "orjson": orjson_path, "model": model_path}
+    print(f"{'payload':>10} {'path':>8} {'ms':>9} {'peak MB':>8}")
+    for size in SIZES:
+        docs = [make_document(size)]
+        number = max(1, 2_000_000 // size)
+        for name, fn in paths.items():
+            seconds = min(timeit.repeat(lambda: fn(docs), number=number, repeat=3))
+            peak = peak_alloc(fn, docs) / 1_000_000
+            print(
+                f"{size // 1000:>8}KB {name:>8} {seconds / number * 1000:>9.2f} {peak:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
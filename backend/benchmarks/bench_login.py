@@ -0,0 +1,83 @@
+"""
+Login latency: sequential steps vs the concurrent login_user pipeline.
+
+Replaces the Firebase calls and the MongoDB upsert with sleeps of a given
+latency, then times the old sequential flow against login_user. With
+cookie minting and the user upsert running concurrently, the critical path
+should shrink from verify + cookie + upsert to verify + max(cookie, upsert).
+Needs a working `.env` (the service imports the app settings).
+
+Usage:
+    uv run python benchmarks/bench_login.py
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from firebase_admin import auth  # noqa: E402
+
+from api.auth import service  # noqa: E402
+from utils.firebase.firebase_manager import firebase_manager  # noqa: E402
+
+VERIFY_MS = 5
+# (cookie minting ms, user upsert ms)
+SCENARIOS = [(80, 20), (80, 80), (150, 40), (40, 150)]
+RUNS = 20
+
+USER_INFO = {"uid": "uid-123", "email": "user@example.com", "name": "", "picture": ""}
+
+
+def patch(cookie_ms: int, upsert_ms: int) -> None:
+    async def verify(token: str) -> dict:
+        await asyncio.sleep(VERIFY_MS / 1000)
+        return USER_INFO
+
+    def create_session_cookie(token, expires_in):
+        time.sleep(cookie_ms / 1000)
+        return "session-cookie"
+
+    def create_or_get_user(user_info: dict) -> dict:
+        time.sleep(upsert_ms / 1000)
+        return {"firebase_uid": user_info["uid"]}
+
+    firebase_manager.verify_firebase_id_token = verify
+    auth.create_session_cookie = create_session_cookie
+    service._create_or_get_user = create_or_get_user
+
+
+async def sequential(id_token: str) -> None:
+    # The pre-pipeline init_user flow
+    user_info = await firebase_manager.verify_firebase_id_token(id_token)
+    auth.create_session_cookie(id_token, expires_in=service.SESSION_EXPIRES_IN)
+    service._create_or_get_user(user_info)
+
+
+async def pipeline(id_token: str) -> None:
+    await service.login_user(id_token)
+
+
+async def p50_ms(flow) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await flow("a.b.c")
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    print(f"{'cookie':>7} {'upsert':>7} {'sequential':>11} {'pipeline':>9}")
+    for cookie_ms, upsert_ms in SCENARIOS:
+        patch(cookie_ms, upsert_ms)
+        seq = await p50_ms(sequential)
+        con = await p50_ms(pipeline)
+        print(f"{cookie_ms:>5}ms {upsert_ms:>5}ms {seq:>9.1f}ms {con:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
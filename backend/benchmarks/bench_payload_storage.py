@@ -0,0 +1,134 @@
+"""
+Working-set size of the results collection, inline vs offloaded payloads.
+
+Builds a results collection of N documents with `external` payloads of
+mixed sizes (shaped like stored LLM/Tavily output) and reports the total
+BSON size of the results documents:
+
+- inline:     every payload stored in the result document (before)
+- offloaded:  payloads above RESULT_PAYLOAD_INLINE_LIMIT replaced by an
+              `external_ref` stub, as PayloadStore.offload does
+
+The listing queries scan the results documents, so the offloaded total is
+what has to stay in cache. Also reports the compressed size of the moved
+payloads and the per-payload encode/decode cost paid by
+find_result_by_task. No database needed; needs a working `.env`.
+
+Usage:
+    uv run python benchmarks/bench_payload_storage.py
+"""
+
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import bson
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from settings import settings  # noqa: E402
+from utils.mongo.payload_store import REF_FIELD, PayloadStore, _decompress  # noqa: E402
+
+DOCUMENTS = 2_000
+# (payload size in bytes, share of documents)
+PAYLOAD_MIX = [(2_000, 0.3), (30_000, 0.4), (250_000, 0.25), (2_000_000, 0.05)]
+
+WORDS = (
+    "pinterest board trend aesthetic summer palette minimal interior "
+    "engagement audience keyword ranking creator content strategy"
+).split()
+
+
+def make_payload(size: int, rng: random.Random) -> dict:
+    results = []
+    total = 0
+    while total < size:
+        content = " ".join(rng.choices(WORDS, k=60))
+        results.append(
+            {
+                "title": " ".join(rng.choices(WORDS, k=6)),
+                "url": f"https://example.com/{rng.randrange(10**9)}",
+                "content": content,
+                "score": rng.random(),
+            }
+        )
+        total += len(content) + 80
+    return {"summary": " ".join(rng.choices(WORDS, k=120)), "results": results}
+
+
+def make_document(size: int, rng: random.Random) -> dict:
+    return {
+        "_id": ObjectId(),
+        "service": "pinterest",
+        "user_id": f"uid-{rng.randrange(200)}",
+        "task_id": str(ObjectId()),
+        "timestamp": datetime.now(UTC),
+        "original_query": " ".join(rng.choices(WORDS, k=8)),
+        "external": make_payload(size, rng),
+    }
+
+
+def stub(document: dict) -> tuple[dict, int, float, float]:
+    """Offload like PayloadStore.offload; returns (stub, stored bytes, encode s, decode s)."""
+    started = time.perf_counter()
+    encoded = PayloadStore.encode(document["external"])
+    encode_s = time.perf_counter() - started
+    if encoded is None:
+        return document, 0, 0.0, 0.0
+
+    codec, data, raw_size = encoded
+    started = time.perf_counter()
+    bson.decode(_decompress(codec, data))
+    decode_s = time.perf_counter() - started
+
+    document = dict(document)
+    document["external"] = None
+    document[REF_FIELD] = {
+        "store": "collection",
+        "id": ObjectId(),
+        "codec": codec,
+        "size": raw_size,
+    }
+    return document, len(data), encode_s, decode_s
+
+
+def main() -> None:
+    rng = random.Random(7)
+    sizes = rng.choices(
+        [size for size, _ in PAYLOAD_MIX],
+        weights=[share for _, share in PAYLOAD_MIX],
+        k=DOCUMENTS,
+    )
+    documents = [make_document(size, rng) for size in sizes]
+
+    inline = sum(len(bson.encode(doc)) for doc in documents)
+
+    offloaded = stored = moved = 0
+    encode_s = decode_s = 0.0
+    for doc in documents:
+        stubbed, stored_bytes, enc, dec = stub(doc)
+        offloaded += len(bson.encode(stubbed))
+        if stored_bytes:
+            moved += 1
+            stored += stored_bytes
+            encode_s += enc
+            decode_s += dec
+
+    mb = 1024 * 1024
+    print(f"documents:           {DOCUMENTS}")
+    print(f"inline limit:        {settings.RESULT_PAYLOAD_INLINE_LIMIT} bytes")
+    print(f"results (inline):    {inline / mb:9.1f} MB")
+    print(
+        f"results (offloaded): {offloaded / mb:9.1f} MB  ({inline / offloaded:.0f}x smaller)"
+    )
+    print(f"payloads moved:      {moved}, {stored / mb:.1f} MB compressed")
+    if moved:
+        print(f"encode per payload:  {encode_s / moved * 1000:9.2f} ms")
+        print(f"decode per payload:  {decode_s / moved * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
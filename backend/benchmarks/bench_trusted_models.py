@@ -0,0 +1,98 @@
+"""
+Building the results listing from MongoDB documents: validated vs adapter.
+
+Builds ResultListResponse from 10k result documents (as returned by the
+MongoDB listing queries, with `_id` and datetime timestamps) and times:
+
+- validated: ResultListResponse(results=docs), what GET /api/results uses
+- adapter:   one pass of a TypeAdapter(list[ResultSummary]) built once at
+             import, with only the wrapper built by model_construct
+
+each for building the model and for building + model_dump_json (what
+ModelJSONResponse sends), as the median of interleaved runs. Needs no
+`.env` or database.
+
+Both run the same pydantic-core validation of the list, and measure the
+same here; switch the route over only if the adapter shows a clear win.
+
+Usage:
+    uv run python benchmarks/bench_trusted_models.py
+"""
+
+import statistics
+import sys
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from api.results.schema import ResultListResponse, ResultSummary  # noqa: E402
+
+ITEMS = 10_000
+RUNS = 30
+
+RESULT_LIST_ADAPTER = TypeAdapter(list[ResultSummary])
+
+
+def make_documents() -> list[dict]:
+    now = datetime.now(UTC)
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "uid-123",
+            "task_id": str(uuid.uuid4()),
+            "timestamp": now - timedelta(minutes=i),
+            "original_query": f"summer interior trends {i}",
+            "service": "pinterest",
+        }
+        for i in range(ITEMS)
+    ]
+
+
+def median_ms(samples: list[float]) -> float:
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    docs = make_documents()
+    paths = {
+        "validated": lambda: ResultListResponse(results=docs),
+        "adapter": lambda: ResultListResponse.model_construct(
+            results=RESULT_LIST_ADAPTER.validate_python(docs)
+        ),
+    }
+
+    # Both paths must produce the same JSON
+    expected = paths["validated"]().model_dump_json()
+    assert paths["adapter"]().model_dump_json() == expected
+
+    build = {path: [] for path in paths}
+    total = {path: [] for path in paths}
+    # Interleaved, so both paths see the same machine noise
+    for _ in range(RUNS):
+        for path, fn in paths.items():
+            started = time.perf_counter()
+            model = fn()
+            built = time.perf_counter()
+            model.model_dump_json()
+            done = time.perf_counter()
+            build[path].append(built - started)
+            total[path].append(done - started)
+
+    print(f"{ITEMS} items, median of {RUNS}")
+    print(f"{'path':>10} {'build':>9} {'build+json':>11}")
+    for path in paths:
+        print(
+            f"{path:>10} {median_ms(build[path]):>7.1f}ms "
+            f"{median_ms(total[path]):>9.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
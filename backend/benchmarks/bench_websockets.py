@@ -0,0 +1,169 @@
+"""
+Soak test for the WebSocket ConnectionManager.
+
+Runs the manager behind uvicorn in this process, opens many idle sockets
+from client subprocesses, then bursts messages to random users and
+reports delivery, evictions and server memory per connection. Needs a
+working `.env` (the manager imports the app settings).
+
+Handshake auth is replaced by a `?uid=` query parameter so no Firebase
+session cookies are needed.
+
+Usage:
+    uv run python benchmarks/bench_websockets.py --connections 20000 --rate 1000
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.websocket.connection_manager import ConnectionManager  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+class BenchConnectionManager(ConnectionManager):
+    async def authenticate(self, websocket: WebSocket):
+        return {"uid": websocket.query_params["uid"]}
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def hold_sockets(port: int, uids: list[str], duration: float, results) -> None:
+    received = 0
+
+    async def client(uid: str) -> None:
+        nonlocal received
+        uri = f"ws://{HOST}:{port}/ws?uid={uid}"
+        async with websockets.connect(uri, ping_interval=None) as ws:
+            try:
+                while True:
+                    message = json.loads(await ws.recv())
+                    if message["type"] == "batch":
+                        received += len(message["messages"])
+                    else:
+                        received += 1
+            except websockets.ConnectionClosed:
+                pass
+
+    tasks = []
+    for uid in uids:
+        tasks.append(asyncio.create_task(client(uid)))
+        if len(tasks) % 500 == 0:
+            # Don't overflow the server's accept backlog
+            await asyncio.sleep(0.05)
+
+    await asyncio.sleep(duration)
+    results.put(received)
+    for task in tasks:
+        task.cancel()
+
+
+def client_process(port: int, uids: list[str], duration: float, results) -> None:
+    raise_fd_limit()
+    asyncio.run(hold_sockets(port, uids, duration, results))
+
+
+async def main(args: argparse.Namespace) -> None:
+    raise_fd_limit()
+    manager = BenchConnectionManager()
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def ws_endpoint(websocket: WebSocket):
+        conn = await manager.connect(websocket)
+        if conn is not None:
+            await manager.serve(conn)
+
+    config = uvicorn.Config(
+        app,
+        host=HOST,
+        port=args.port,
+        log_level="warning",
+        ws_ping_interval=None,
+        backlog=4096,
+    )
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.1)
+
+    uids = [f"user-{i}" for i in range(args.connections)]
+    baseline = rss_mb()
+
+    hold_for = args.connect_timeout + args.duration + 5
+    results = multiprocessing.Queue()
+    chunks = [uids[i :: args.client_procs] for i in range(args.client_procs)]
+    procs = [
+        multiprocessing.Process(
+            target=client_process, args=(args.port, chunk, hold_for, results)
+        )
+        for chunk in chunks
+    ]
+    for proc in procs:
+        proc.start()
+
+    deadline = time.monotonic() + args.connect_timeout
+    while manager.connection_count < args.connections and time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+    connected = manager.connection_count
+    per_conn_kb = (rss_mb() - baseline) * 1024 / max(connected, 1)
+    print(f"connected:            {connected}/{args.connections}")
+    print(f"server RSS:           {rss_mb():.1f} MB (baseline {baseline:.1f} MB)")
+    print(f"memory / connection:  {per_conn_kb:.1f} KB")
+
+    sent = 0
+    started = time.monotonic()
+    while (elapsed := time.monotonic() - started) < args.duration:
+        # Catch up to the target rate every 10ms tick
+        while sent < elapsed * args.rate:
+            uid = random.choice(uids)
+            await manager.send_to_user(uid, {"type": "progress", "seq": sent})
+            sent += 1
+        await asyncio.sleep(0.01)
+
+    # Clients report once their hold period is over
+    received = await asyncio.to_thread(lambda: sum(results.get() for _ in procs))
+    print(f"sent:                 {sent} ({sent / elapsed:.0f} msg/s)")
+    print(f"received:             {received}")
+    print(f"evictions:            {manager.evictions}")
+
+    for proc in procs:
+        proc.join()
+    await manager.stop()
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=20_000)
+    parser.add_argument("--rate", type=int, default=1_000, help="messages/second")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--client-procs", type=int, default=4)
+    parser.add_argument("--connect-timeout", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8098)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""
+Throughput scaling of the production server from 1 to N workers.
+
+Starts `server.py` once per worker count, hammers one endpoint with a pool
+of client threads and prints requests/second. Needs a working `.env`.
+
+Usage:
+    uv run python benchmarks/bench_workers.py --max-workers 4
+    uv run python benchmarks/bench_workers.py --path /api/auth/who-am-i \
+        --cookie "<session cookie>"
+
+Hitting /api/auth/who-am-i with a valid session cookie exercises the
+CPU-bound session JWT verification, which is what multiple workers buy us.
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def wait_until_ready(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError("server did not become ready")
+
+
+def client_loop(port: int, path: str, cookie: str, deadline: float) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    headers = {"Cookie": f"session={cookie}"} if cookie else {}
+    done = 0
+    while time.monotonic() < deadline:
+        conn.request("GET", path, headers=headers)
+        conn.getresponse().read()
+        done += 1
+    conn.close()
+    return done
+
+
+def run(workers: int, args: argparse.Namespace) -> float:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(args.port)}
+    proc = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(args.port)
+        deadline = time.monotonic() + args.duration
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            futures = [
+                pool.submit(client_loop, args.port, args.path, args.cookie, deadline)
+                for _ in range(args.clients)
+            ]
+            total = sum(f.result() for f in futures)
+        return total / args.duration
+    finally:
+        # SIGTERM exercises the graceful drain path as well
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--cookie", default="")
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        rps = run(workers, args)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
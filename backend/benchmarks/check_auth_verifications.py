@@ -0,0 +1,94 @@
+"""
+Counts session cookie verifications and user lookups per request.
+
+Mounts AuthMiddleware, the auth and results routers and a probe route
+that reads the auth context and the user document twice. Firebase and
+MongoDB are replaced by counters. Every authenticated request must verify
+the cookie exactly once (in AuthMiddleware) and load the user document
+at most once. Exits with status 1 otherwise, so it can gate CI or a
+deploy. Needs a working `.env`.
+
+Usage:
+    uv run python benchmarks/check_auth_verifications.py
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from firebase_admin import auth as firebase_auth  # noqa: E402
+
+from api.auth.route import auth_router  # noqa: E402
+from api.results.route import results_router  # noqa: E402
+from utils.auth_context import AuthContext, get_auth_context  # noqa: E402
+from utils.middleware.auth_middleware import AuthMiddleware  # noqa: E402
+from utils.mongo.mongo_manager import db  # noqa: E402
+
+calls: Counter = Counter()
+CLAIMS = {"uid": "uid-123", "email": "user@example.com", "name": "", "picture": ""}
+
+
+def verify_session_cookie(cookie, check_revoked=False):
+    calls["verify"] += 1
+    return CLAIMS
+
+
+def find_user(firebase_uid, collection_name):
+    calls["find_user"] += 1
+    return {"firebase_uid": firebase_uid, "coins": 3, "is_admin": False}
+
+
+def get_result_aggregates(user_id):
+    return {}
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+    app.include_router(auth_router)
+    app.include_router(results_router)
+
+    @app.get("/probe")
+    async def probe(auth: AuthContext = Depends(get_auth_context)) -> dict:
+        first = await auth.user_doc()
+        second = await auth.user_doc()
+        return {"uid": auth.uid, "coins": first["coins"], "same": first is second}
+
+    return app
+
+
+def check(client: TestClient, path: str, verify: int, find_user: int) -> bool:
+    calls.clear()
+    response = client.get(path, cookies={"session": "cookie"})
+    ok = (
+        response.status_code == 200
+        and calls["verify"] == verify
+        and calls["find_user"] == find_user
+    )
+    print(
+        f"{'ok' if ok else 'FAIL':>4} {path}: status={response.status_code} "
+        f"verifications={calls['verify']} user_lookups={calls['find_user']}"
+    )
+    return ok
+
+
+def main() -> None:
+    firebase_auth.verify_session_cookie = verify_session_cookie
+    db.find_user = find_user
+    db.get_result_aggregates = get_result_aggregates
+
+    client = TestClient(build_app())
+    results = [
+        check(client, "/api/auth/who-am-i", verify=1, find_user=0),
+        check(client, "/api/results/stats", verify=1, find_user=0),
+        check(client, "/probe", verify=1, find_user=1),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Fault injection for the resilience layer.
+
+Drives a small app wired like app.py (AdmissionControlMiddleware in front,
+a route whose "MongoDB" call goes through mongo_dependency in a worker
+thread, and the same 503 handler) with a constant stream of concurrent
+clients through three phases:
+
+- healthy:  the dependency answers in 5ms
+- degraded: it hangs for 2s and then fails
+- healed:   back to 5ms
+
+Per phase it reports status codes, p50/p99 latency, the peak of traced
+memory and the breaker state. It then reports how long after the fault
+clears every request succeeds again. Memory should stay flat in the
+degraded phase, since excess requests are shed rather than queued, and
+recovery should take about BREAKER_RECOVERY_TIMEOUT plus the time the
+hanging calls need to drain.
+
+Exits with status 1 when the degraded-phase memory peak exceeds
+MAX_DEGRADED_PEAK_MB or recovery takes longer than MAX_RECOVERY_SECONDS,
+so it can gate a CI job.
+
+Needs a working `.env`; no database is used.
+
+Usage:
+    uv run python benchmarks/fault_injection.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+# Small limits so the fault shows up within seconds
+os.environ.setdefault("BREAKER_FAILURE_THRESHOLD", "5")
+os.environ.setdefault("BREAKER_RECOVERY_TIMEOUT", "2")
+os.environ.setdefault("MONGO_MAX_CONCURRENCY", "32")
+os.environ.setdefault("ADMISSION_MAX_IN_FLIGHT", "32")
+os.environ.setdefault("ADMISSION_MAX_QUEUE", "64")
+os.environ.setdefault("ADMISSION_QUEUE_SLO", "0.25")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from settings import settings  # noqa: E402
+from utils.middleware.admission_middleware import (  # noqa: E402
+    AdmissionControlMiddleware,
+    admission_controller,
+)
+from utils.resilience.dependency import (  # noqa: E402
+    DependencyUnavailableError,
+    mongo_dependency,
+)
+
+CLIENTS = 50
+PHASE_SECONDS = 4.0
+DEGRADED_LATENCY = 2.0
+
+# Pass/fail bounds
+MAX_DEGRADED_PEAK_MB = 16.0
+# Breaker recovery, plus draining the calls still hanging when the fault clears
+MAX_RECOVERY_SECONDS = settings.BREAKER_RECOVERY_TIMEOUT + DEGRADED_LATENCY + 1.0
+
+
+class FakeMongo:
+    latency = 0.005
+    failing = False
+
+    def query(self) -> dict:
+        time.sleep(self.latency)
+        if self.failing:
+            raise ConnectionError("injected fault")
+        return {"ok": True}
+
+
+fake = FakeMongo()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work() -> dict:
+        return await mongo_dependency.run(fake.query)
+
+    @app.exception_handler(DependencyUnavailableError)
+    async def unavailable(request: Request, exc: DependencyUnavailableError):
+        return JSONResponse(
+            status_code=503,
+            content={"success": False},
+            headers={"Retry-After": exc.retry_after_header},
+        )
+
+    @app.exception_handler(ConnectionError)
+    async def failed(request: Request, exc: ConnectionError):
+        return JSONResponse(status_code=500, content={"success": False})
+
+    app.add_middleware(AdmissionControlMiddleware)
+    return app
+
+
+async def client_loop(client: httpx.AsyncClient, log: list, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.monotonic()
+        response = await client.get("/work")
+        log.append((started, time.monotonic() - started, response.status_code))
+        if response.status_code == 503:
+            # Well-behaved client: back off before retrying
+            await asyncio.sleep(min(float(response.headers["Retry-After"]), 0.2))
+
+
+def report(name: str, log: list, start: float, end: float, peak: int) -> None:
+    samples = [(lat, code) for at, lat, code in log if start <= at + lat < end]
+    codes = Counter(code for _, code in samples)
+    latencies = sorted(lat * 1000 for lat, _ in samples) or [0.0]
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if len(latencies) > 1 else 0.0
+    print(
+        f"{name:>9}: {len(samples):>6} requests {dict(sorted(codes.items()))} "
+        f"p50={statistics.median(latencies):.0f}ms p99={p99:.0f}ms "
+        f"peak_mem={peak / 1024 / 1024:.1f}MB"
+    )
+
+
+async def main() -> None:
+    transport = httpx.ASGITransport(app=build_app())
+    log: list = []
+    stop = asyncio.Event()
+
+    tracemalloc.start()
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=30
+    ) as client:
+        clients = [
+            asyncio.create_task(client_loop(client, log, stop)) for _ in range(CLIENTS)
+        ]
+
+        phases = []
+        for name, latency, failing in [
+            ("healthy", 0.005, False),
+            ("degraded", DEGRADED_LATENCY, True),
+            ("healed", 0.005, False),
+        ]:
+            fake.latency, fake.failing = latency, failing
+            tracemalloc.reset_peak()
+            start = time.monotonic()
+            await asyncio.sleep(PHASE_SECONDS)
+            phases.append(
+                (name, start, time.monotonic(), tracemalloc.get_traced_memory()[1])
+            )
+            print(f"{name:>9}: breaker={mongo_dependency.breaker.state}")
+
+        stop.set()
+        await asyncio.gather(*clients)
+
+    # Reported by completion time, once the slow requests have finished too
+    for name, start, end, peak in phases:
+        report(name, log, start, end, peak)
+
+    healed_at = phases[2][1]
+    healed = [(at, code) for at, _, code in log if at >= healed_at]
+    # Recovered once every request started from then on succeeds
+    errors = [at for at, code in healed if code != 200]
+    recovered = max(errors, default=healed_at)
+    if not any(at > recovered for at, _ in healed):
+        recovery = None
+        print("recovery: no clean run of requests after the fault cleared")
+    else:
+        recovery = recovered - healed_at
+        print(
+            f"recovery: every request succeeds {recovery:.2f}s after the fault "
+            f"cleared (BREAKER_RECOVERY_TIMEOUT={settings.BREAKER_RECOVERY_TIMEOUT}s)"
+        )
+    print(f"admission: {admission_controller.snapshot()}")
+    print(f"mongo:     {mongo_dependency.snapshot()}")
+
+    failures = []
+    degraded_peak_mb = phases[1][3] / 1024 / 1024
+    if degraded_peak_mb > MAX_DEGRADED_PEAK_MB:
+        failures.append(
+            f"degraded peak memory {degraded_peak_mb:.1f}MB > {MAX_DEGRADED_PEAK_MB}MB"
+        )
+    if recovery is None or recovery > MAX_RECOVERY_SECONDS:
+        failures.append(
+            f"recovery {'never' if recovery is None else f'{recovery:.2f}s'} "
+            f"> {MAX_RECOVERY_SECONDS}s"
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Read-your-writes check for secondary reads against a replica set.
+
+Inserts results through MongoDB.insert_one and reads each one back right
+away with find_result_by_task, which goes to a secondary when
+MONGO_SECONDARY_READS_ENABLED is set. Write and read run as two separate
+requests would (see CausalTokenMiddleware), so nothing but the cookie
+value carries over. Runs twice:
+
+- causal:   the read request sends the write's causal token cookie
+- no token: the read request sends no cookie, plain secondaryPreferred reads
+
+With causal tokens every result must be found; without them some reads
+usually miss because the secondary has not replicated the insert yet.
+
+Needs a replica set with secondaries (see BACKEND_SETUP.md) and a `.env`
+with MONGO_SECONDARY_READS_ENABLED=true. Writes to and then cleans up
+RESULT_COLLECTION documents with user_id "causal-check".
+
+Usage:
+    uv run python benchmarks/verify_causal_reads.py
+"""
+
+import contextvars
+import sys
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from settings import settings  # noqa: E402
+from utils.mongo import causal  # noqa: E402
+from utils.mongo.mongo_manager import db  # noqa: E402
+
+USER_ID = "causal-check"
+ROUNDS = 200
+
+
+def write_request(task_id: str) -> str:
+    """Store a result as a request would; returns its causal token cookie."""
+    writes: list[causal.CausalToken] = []
+    causal.set_request_tokens(None, writes)
+    db.insert_one(
+        {
+            "service": "pinterest",
+            "user_id": USER_ID,
+            "task_id": task_id,
+            "timestamp": datetime.now(UTC),
+            "original_query": "causal check",
+            "external": {"ok": True},
+        },
+        settings.RESULT_COLLECTION,
+    )
+    return causal.newest(writes).encode()
+
+
+def read_request(task_id: str, cookie: Optional[str]) -> bool:
+    """Read the result back as a later request sending `cookie` would."""
+    token = causal.CausalToken.decode(cookie) if cookie else None
+    causal.set_request_tokens(token, [])
+    return (
+        db.find_result_by_task(USER_ID, task_id, settings.RESULT_COLLECTION) is not None
+    )
+
+
+def run(label: str, send_cookie: bool) -> None:
+    misses = 0
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        task_id = str(uuid.uuid4())
+        # A fresh context per request, as separate workers would have
+        cookie = contextvars.Context().run(write_request, task_id)
+        found = contextvars.Context().run(
+            read_request, task_id, cookie if send_cookie else None
+        )
+        if not found:
+            misses += 1
+    elapsed = (time.perf_counter() - started) / ROUNDS * 1000
+    print(
+        f"{label:>9}: {misses}/{ROUNDS} reads missed their own write, {elapsed:.1f}ms/round"
+    )
+
+
+def main() -> None:
+    if not settings.MONGO_SECONDARY_READS_ENABLED:
+        sys.exit("Set MONGO_SECONDARY_READS_ENABLED=true to route reads to secondaries")
+
+    hello = db.get_db().command("hello")
+    print(f"replica set {hello.get('setName')}: {len(hello.get('hosts', []))} members")
+
+    try:
+        run("causal", send_cookie=True)
+        run("no token", send_cookie=False)
+    finally:
+        db.get_db()[settings.RESULT_COLLECTION].delete_many({"user_id": USER_ID})
+        db.get_db()[settings.RESULT_AGGREGATE_COLLECTION].delete_many(
+            {"_id.user_id": USER_ID}
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
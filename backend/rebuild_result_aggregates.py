@@ -0,0 +1,24 @@
+"""
+Result aggregate rebuild job.
+
+Recomputes the per-user, per-service counts in RESULT_AGGREGATE_COLLECTION
+from the results and their archive. The counts are maintained on every
+insert, so this is only needed after a backfill, manual deletes, a purge
+(see archive_results.py) or a failed incremental update.
+
+Usage:
+    python rebuild_result_aggregates.py
+"""
+
+from utils.mongo.mongo_manager import db
+
+
+def main() -> None:
+    try:
+        db.rebuild_result_aggregates()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
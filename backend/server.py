@@ -0,0 +1,103 @@
+"""
+Production server launcher.
+
+Runs the app under uvicorn's multi-process supervisor with one worker per
+available CPU. Each worker is a freshly spawned interpreter that imports
+the app and opens its own MongoDB pool in the lifespan hook, so nothing
+fork-unsafe (pymongo sockets, Firebase HTTP sessions) is ever inherited.
+
+Usage:
+    python server.py
+
+Worker count comes from WEB_CONCURRENCY, or the container CPU quota.
+On SIGTERM uvicorn stops accepting connections, lets in-flight requests
+finish for up to GRACEFUL_SHUTDOWN_TIMEOUT seconds and closes WebSockets
+with code 1012 (service restart) so clients reconnect elsewhere.
+"""
+
+import importlib.util
+import math
+import os
+from typing import Optional
+
+import uvicorn
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Return the CPU quota imposed by the container, if any."""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def get_worker_count() -> int:
+    """Number of workers to run: explicit setting, else CPU quota, else CPU count."""
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+
+    return max(1, cpus)
+
+
+def _pick(module: str, preferred: str, fallback: str) -> str:
+    return preferred if importlib.util.find_spec(module) else fallback
+
+
+def main() -> None:
+    workers = get_worker_count()
+    loop = _pick("uvloop", "uvloop", "asyncio")
+    http = _pick("httptools", "httptools", "h11")
+
+    logger.info(f"Starting server: workers={workers}, loop={loop}, http={http}")
+
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=settings.PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        ws_ping_timeout=60,
+        ws_ping_interval=20,
+        timeout_keep_alive=75,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+        # Cloud Run / load balancers terminate TLS in front of us
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,6 +42,63 @@ class Settings(BaseSettings):
         default="results", description="User collection name"
     )
     USER_COLLECTION: str = Field(default="users", description="user collection name")
+    MONGO_SECONDARY_READS_ENABLED: bool = Field(
+        default=False,
+        description="Serve result listings and fetches from secondaries (needs a replica set)",
+    )
+    MONGO_MAX_STALENESS_SECONDS: int = Field(
+        default=90,
+        ge=90,
+        description="Most a secondary may lag behind the primary and still serve reads",
+    )
+
+    RESULT_AGGREGATE_COLLECTION: str = Field(
+        default="result_aggregates",
+        description="Per-user, per-service result counts maintained on insert",
+    )
+    CHANGE_STREAM_STATE_COLLECTION: str = Field(
+        default="change_stream_state",
+        description="Collection holding persisted change stream resume tokens",
+    )
+
+    # Result payload storage
+    RESULT_PAYLOAD_COLLECTION: str = Field(
+        default="result_payloads",
+        description="Collection holding compressed result payloads",
+    )
+    RESULT_PAYLOAD_BUCKET: str = Field(
+        default="result_payloads_fs",
+        description="GridFS bucket for payloads too large for one document",
+    )
+    RESULT_PAYLOAD_INLINE_LIMIT: int = Field(
+        default=16 * 1024,
+        ge=0,
+        description="Largest payload (BSON bytes) kept inline in the result document",
+    )
+    RESULT_PAYLOAD_GRIDFS_THRESHOLD: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Compressed payloads above this size (bytes) go to GridFS",
+    )
+    RESULT_ARCHIVE_COLLECTION: str = Field(
+        default="results_archive",
+        description="Cold tier collection for old results",
+    )
+    RESULT_ARCHIVE_AFTER_DAYS: int = Field(
+        default=90,
+        ge=1,
+        description="Age in days after which results move to the cold tier",
+    )
+    RESULT_PURGE_AFTER_DAYS: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Age in days after which archived results are deleted (never if unset)",
+    )
+
+    RESULT_CHANGE_STREAM_ENABLED: bool = Field(
+        default=False,
+        description="Push new results to clients via a change stream (needs a replica set)",
+    )
 
     MAX_TAVILY_RESULTS: int = Field(
         default=10, description="Max number of Tavily results"
@@ -54,6 +111,138 @@ class Settings(BaseSettings):
         description="Initional coin to be given to the user",
     )
 
+    LOGIN_TIMEOUT: float = Field(
+        default=10.0,
+        gt=0,
+        description="Deadline in seconds for the whole login pipeline",
+    )
+    ACTIVITY_FLUSH_INTERVAL: float = Field(
+        default=5.0,
+        ge=0,
+        description="Seconds between last_login write-behind flushes (0 writes through)",
+    )
+
+    # Production server
+    PORT: int = Field(default=8080, description="Port the production server binds")
+    WEB_CONCURRENCY: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Number of server workers, derived from the CPU quota if unset",
+    )
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds to drain in-flight requests on SIGTERM",
+    )
+
+    # WebSocket connections
+    WS_SEND_QUEUE_SIZE: int = Field(
+        default=256,
+        ge=1,
+        description="Pending messages per socket before it is evicted as a slow consumer",
+    )
+    WS_SEND_TIMEOUT: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds a single socket write may take before eviction",
+    )
+    WS_BATCH_WINDOW: float = Field(
+        default=0.02,
+        ge=0,
+        description="Seconds to wait for more messages before flushing a batch",
+    )
+    WS_REDIS_FANOUT_ENABLED: bool = Field(
+        default=False,
+        description="Fan out WebSocket messages to other workers via Redis pub/sub",
+    )
+
+    # Progress events (Server-Sent Events fallback)
+    PROGRESS_STREAM_MAXLEN: int = Field(
+        default=50,
+        ge=1,
+        description="Recent progress events kept per task for Last-Event-ID resume",
+    )
+    PROGRESS_STREAM_TTL: int = Field(
+        default=3600,
+        ge=1,
+        description="Seconds a task's progress events are kept after the last one",
+    )
+    SSE_HEARTBEAT_INTERVAL: int = Field(
+        default=15,
+        ge=1,
+        description="Seconds between SSE heartbeat comments on idle streams",
+    )
+
+    COMPRESSION_MIN_SIZE: int = Field(
+        default=1024,
+        ge=0,
+        description="Smallest JSON response body (bytes) that gets compressed",
+    )
+
+    ADMIN_TOKEN: Optional[SecretStr] = Field(
+        default=None,
+        description="Secret for the X-Admin-Token header of admin endpoints; disabled if unset",
+    )
+
+    # Resilience: circuit breakers, bulkheads and admission control
+    BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        ge=1,
+        description="Consecutive failures that open a dependency's circuit breaker",
+    )
+    BREAKER_RECOVERY_TIMEOUT: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds an open circuit rejects calls before a probe is let through",
+    )
+    MONGO_MAX_CONCURRENCY: int = Field(
+        default=64,
+        ge=1,
+        description="Most MongoDB calls in flight per worker; more fail fast",
+    )
+    FIREBASE_MAX_CONCURRENCY: int = Field(
+        default=32,
+        ge=1,
+        description="Most Firebase calls in flight per worker; more fail fast",
+    )
+    FIREBASE_CALL_TIMEOUT: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds to wait for a Firebase call; a timeout counts as a failure",
+    )
+    ADMISSION_MAX_IN_FLIGHT: int = Field(
+        default=100,
+        ge=1,
+        description="Requests processed concurrently per worker; more wait in a queue",
+    )
+    ADMISSION_MAX_QUEUE: int = Field(
+        default=200,
+        ge=0,
+        description="Requests allowed to wait for admission before new ones are shed",
+    )
+    ADMISSION_QUEUE_SLO: float = Field(
+        default=0.5,
+        gt=0,
+        description="Most seconds a request may wait for admission before a 503",
+    )
+
+    # Per-request profiling (needs pyinstrument)
+    PROFILING_SAMPLE_RATE: float = Field(
+        default=0.0,
+        ge=0,
+        le=1,
+        description="Fraction of requests profiled without the X-Profile header",
+    )
+    PROFILE_DIR: str = Field(
+        default="/tmp/profiles",
+        description="Directory where speedscope profiles are written",
+    )
+    PROFILE_RETENTION: int = Field(
+        default=200,
+        ge=1,
+        description="Number of most recent profiles kept on disk",
+    )
+
     # -------------------------------------------------
     # Derived configuration
     # -------------------------------------------------
@@ -0,0 +1,14 @@
+import hmac
+
+from settings import settings
+
+ADMIN_TOKEN_HEADER = "x-admin-token"
+
+
+def is_admin_token(token: str) -> bool:
+    """Whether a token matches ADMIN_TOKEN (constant-time compare)."""
+    if settings.ADMIN_TOKEN is None or not token:
+        return False
+    return hmac.compare_digest(
+        token.encode(), settings.ADMIN_TOKEN.get_secret_value().encode()
+    )
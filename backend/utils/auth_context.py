@@ -0,0 +1,81 @@
+"""
+Request-scoped auth context.
+
+AuthMiddleware verifies the session cookie once per request and stores
+the result here. Routes take it as a dependency instead of verifying the
+cookie again:
+
+    @router.get("/me")
+    async def me(auth: AuthContext = Depends(get_auth_context)):
+        user = await auth.user_doc()  # loaded from MongoDB at most once
+        return {"uid": auth.uid, "coins": user["coins"]}
+"""
+
+import asyncio
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from settings import settings
+from utils.mongo.mongo_manager import db
+
+
+class AuthContext:
+    """Verified identity of the current request's user."""
+
+    __slots__ = ("uid", "email", "name", "picture", "_user_doc", "_loaded", "_lock")
+
+    def __init__(self, user_info: dict) -> None:
+        self.uid: str = user_info["uid"]
+        self.email: str = user_info.get("email", "")
+        self.name: str = user_info.get("name", "")
+        self.picture: str = user_info.get("picture", "")
+        self._user_doc: Optional[dict] = None
+        # Separate from _user_doc, which is also None for an unknown user
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def user_doc(self) -> Optional[dict]:
+        """
+        The user's MongoDB document (coins, is_admin, ...), or None.
+
+        Fetched on first use and cached for the rest of the request.
+        """
+        if not self._loaded:
+            async with self._lock:
+                if not self._loaded:
+                    self._user_doc = await asyncio.to_thread(
+                        db.find_user, self.uid, settings.USER_COLLECTION
+                    )
+                    self._loaded = True
+        return self._user_doc
+
+    async def is_admin(self) -> bool:
+        user = await self.user_doc()
+        return bool(user and user.get("is_admin", False))
+
+
+_current_auth: ContextVar[Optional[AuthContext]] = ContextVar(
+    "current_auth", default=None
+)
+
+
+def set_auth_context(user_info: dict) -> Token:
+    """Store the verified user for the current request; see AuthMiddleware."""
+    return _current_auth.set(AuthContext(user_info))
+
+
+def reset_auth_context(token: Token) -> None:
+    _current_auth.reset(token)
+
+
+def get_auth_context() -> AuthContext:
+    """FastAPI dependency: the authenticated user of this request."""
+    auth = _current_auth.get()
+    if auth is None:
+        # Public path, or a route mounted outside AuthMiddleware
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+    return auth
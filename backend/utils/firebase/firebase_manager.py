@@ -1,8 +1,11 @@
+from datetime import timedelta
+
 import firebase_admin
 from firebase_admin import auth, credentials, json
 
 from settings import settings
 from utils.logger import get_logger
+from utils.resilience.dependency import DependencyUnavailableError, firebase_dependency
 
 logger = get_logger(__name__)
 
@@ -73,7 +76,8 @@ class FirebaseManager:
 
         try:
             # Verify token using Firebase Admin SDK
-            decoded_token = auth.verify_id_token(token)
+            with firebase_dependency.call():
+                decoded_token = auth.verify_id_token(token)
 
             # Extract user information
             user_info = {
@@ -86,6 +90,9 @@ class FirebaseManager:
             logger.info(f"Token verified successfully for user: {user_info['email']}")
             return user_info
 
+        except DependencyUnavailableError:
+            raise
+
         except auth.InvalidIdTokenError as e:
             # Token signature is invalid or token is expired
             logger.error(f"Invalid Firebase token: {e}")
@@ -99,6 +106,27 @@ class FirebaseManager:
             logger.error(f"Error verifying Firebase token: {e}", exc_info=True)
             raise FirebaseTokenError(f"Token verification failed: {str(e)}")
 
+    @staticmethod
+    async def create_session_cookie(token: str, expires_in: timedelta) -> str:
+        """
+        Mint a Firebase session cookie from a verified ID token.
+
+        This is a remote call to Firebase, so it runs in a worker thread to
+        keep the event loop free.
+
+        Args:
+            token: Firebase ID token from frontend
+            expires_in: Session lifetime (between 5 minutes and 14 days)
+
+        Returns:
+            Session cookie value
+        """
+        session_cookie = await firebase_dependency.run(
+            auth.create_session_cookie, token, expires_in=expires_in
+        )
+        logger.info("Firebase session cookie created")
+        return session_cookie
+
     async def verify_firebase_session_cookie(self, cookie: str) -> dict:
         """
         Verify Firebase session cookie and extract user information.
@@ -117,9 +145,13 @@ class FirebaseManager:
 
         Raises:
             FirebaseTokenError: If cookie is invalid or expired
+            DependencyUnavailableError: If Firebase calls are being shed
         """
         try:
-            decoded_claims = auth.verify_session_cookie(cookie, check_revoked=True)
+            # The revocation check is a remote call; keep it off the event loop
+            decoded_claims = await firebase_dependency.run(
+                auth.verify_session_cookie, cookie, check_revoked=True
+            )
 
             # Format to match verify_firebase_id_token output
             user_info = {
@@ -134,6 +166,9 @@ class FirebaseManager:
             )
             return user_info
 
+        except DependencyUnavailableError:
+            raise
+
         except Exception as e:
             logger.error(f"Session cookie verification failed: {e}")
             raise FirebaseTokenError(f"Invalid or expired session cookie: {str(e)}")
@@ -0,0 +1,86 @@
+"""
+ETag / conditional GET helpers for the results endpoints.
+
+The ETag is computed from MongoDB.get_results_version (a count and the
+newest `_id`/`timestamp`), so a poll that matches `If-None-Match` is
+answered with 304 before any result document is read. Used by
+GET /api/results and GET /api/results/{task_id} (api/results/route.py).
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from settings import settings
+from utils.mongo.mongo_manager import db
+
+# Suffixes CompressionMiddleware appends to ETags of encoded representations
+ENCODING_SUFFIXES = ("-zstd", "-br", "-gzip")
+
+
+def make_etag(*parts: object) -> str:
+    """Build a quoted strong ETag from the given parts."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def results_etag(
+    user_id: str,
+    service: Optional[str] = None,
+    task_id: Optional[str] = None,
+) -> Optional[str]:
+    """
+    ETag for a user's results listing, or a single task result.
+
+    Returns None if the version query fails; callers then skip caching.
+    """
+    version = db.get_results_version(
+        user_id,
+        settings.RESULT_COLLECTION,
+        service=service,
+        task_id=task_id,
+    )
+    if version is None:
+        return None
+
+    return make_etag(
+        user_id,
+        service,
+        task_id,
+        version["count"],
+        version["latest_id"],
+        version["latest_timestamp"],
+    )
+
+
+def _strip_encoding(etag: str) -> str:
+    for suffix in ENCODING_SUFFIXES:
+        if etag.endswith(f'{suffix}"'):
+            return etag[: -len(suffix) - 1] + '"'
+    return etag
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    """True if the request's If-None-Match matches the current ETag."""
+    if etag is None:
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = {
+        _strip_encoding(tag.strip().removeprefix("W/"))
+        for tag in if_none_match.split(",")
+    }
+    return etag in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"etag": etag, "vary": "Accept-Encoding"},
+    )
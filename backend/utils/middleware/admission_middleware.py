@@ -0,0 +1,130 @@
+# utils/middleware/admission_middleware.py
+import asyncio
+import math
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from settings import settings
+from utils.logger import get_logger
+from utils.middleware.streaming import is_event_stream_path
+
+logger = get_logger(__name__)
+
+# Never shed the health check or the metrics used to diagnose overload
+EXEMPT_PATHS = {"/", "/api/admin/metrics"}
+
+# Weight of the newest sample in the queue-time moving average
+EWMA_ALPHA = 0.2
+
+
+class AdmissionController:
+    """
+    Queue-time based admission control for one worker.
+
+    At most ADMISSION_MAX_IN_FLIGHT requests run at once; the rest wait
+    for a slot. A request is shed with a 503 when:
+
+    - ADMISSION_MAX_QUEUE requests are already waiting,
+    - it has waited ADMISSION_QUEUE_SLO seconds without getting a slot, or
+    - all slots are taken and the average recent queue time already
+      exceeds the SLO, so it would most likely time out anyway.
+
+    Waiting requests hold no more than a coroutine each, and the queue is
+    bounded, so overload turns into fast 503s instead of growing memory.
+    """
+
+    def __init__(self) -> None:
+        self._slots = asyncio.Semaphore(settings.ADMISSION_MAX_IN_FLIGHT)
+        self.in_flight = 0
+        self.waiting = 0
+        self.queue_time_avg = 0.0
+        self.admitted = 0
+        self.shed = 0
+
+    def _observe(self, queue_time: float) -> None:
+        self.queue_time_avg += EWMA_ALPHA * (queue_time - self.queue_time_avg)
+
+    async def acquire(self) -> bool:
+        """Wait for a slot. Returns False if the request should be shed."""
+        if not self._slots.locked():
+            await self._slots.acquire()
+            self._observe(0.0)
+        else:
+            if (
+                self.waiting >= settings.ADMISSION_MAX_QUEUE
+                or self.queue_time_avg > settings.ADMISSION_QUEUE_SLO
+            ):
+                self.shed += 1
+                return False
+
+            started = time.monotonic()
+            self.waiting += 1
+            try:
+                async with asyncio.timeout(settings.ADMISSION_QUEUE_SLO):
+                    await self._slots.acquire()
+            except TimeoutError:
+                self._observe(time.monotonic() - started)
+                self.shed += 1
+                return False
+            finally:
+                self.waiting -= 1
+            self._observe(time.monotonic() - started)
+
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": settings.ADMISSION_MAX_IN_FLIGHT,
+            "waiting": self.waiting,
+            "queue_time_avg": round(self.queue_time_avg, 4),
+            "queue_slo": settings.ADMISSION_QUEUE_SLO,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+admission_controller = AdmissionController()
+
+
+class AdmissionControlMiddleware:
+    """Sheds HTTP requests with 503 + Retry-After when the worker is overloaded."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        # Event streams stay open for minutes and would pin a slot each.
+        # Matched by route, not by a client-controlled Accept header.
+        if is_event_stream_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        if not await admission_controller.acquire():
+            logger.warning(f"Shedding {scope['method']} {scope['path']}: overloaded")
+            response = JSONResponse(
+                status_code=503,
+                content={"success": False, "message": "Server overloaded, retry later"},
+                headers={
+                    "Retry-After": str(max(1, math.ceil(settings.ADMISSION_QUEUE_SLO)))
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.release()
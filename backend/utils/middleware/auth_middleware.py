@@ -3,8 +3,10 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from utils.auth_context import reset_auth_context, set_auth_context
 from utils.firebase.firebase_manager import firebase_manager
 from utils.logger import get_logger
+from utils.resilience.dependency import DependencyUnavailableError
 
 logger = get_logger(__name__)
 
@@ -48,9 +50,27 @@ class AuthMiddleware(BaseHTTPMiddleware):
             request.state.user = user_info  # store verified user info
 
             logger.debug(f"Authenticated user {user_info.get('email')} for {path}")
-            response = await call_next(request)
+            # Routes read it with Depends(get_auth_context); no second verification
+            auth_token = set_auth_context(user_info)
+            try:
+                response = await call_next(request)
+            finally:
+                reset_auth_context(auth_token)
             return response
 
+        except DependencyUnavailableError as e:
+            # Firebase (or Mongo, further down) is failing or saturated; the
+            # cookie may well be fine, so don't answer 401
+            logger.warning(f"Dependency unavailable on {path}: {e}")
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "success": False,
+                    "message": "Service temporarily unavailable",
+                },
+                headers={"Retry-After": e.retry_after_header},
+            )
+
         except Exception as e:
             logger.warning(f"Invalid or expired session cookie: {e}")
             return JSONResponse(
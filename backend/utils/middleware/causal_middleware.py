@@ -0,0 +1,38 @@
+# utils/middleware/causal_middleware.py
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from settings import settings
+from utils.mongo import causal
+
+
+class CausalTokenMiddleware(BaseHTTPMiddleware):
+    """
+    Carries the causal token of a user's writes through the client.
+
+    The token from the request's cookie is what the request's secondary
+    reads wait for, whichever worker serves them. A response to a request
+    that stored a result sets the cookie to that write's token. It expires
+    after MONGO_MAX_STALENESS_SECONDS, when every eligible secondary has
+    the write anyway.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        cookie = request.cookies.get(causal.COOKIE_NAME)
+        client_token = causal.CausalToken.decode(cookie) if cookie else None
+
+        writes: list[causal.CausalToken] = []
+        tokens = causal.set_request_tokens(client_token, writes)
+        try:
+            response = await call_next(request)
+        finally:
+            causal.reset_request_tokens(tokens)
+
+        token = causal.newest(writes)
+        if token is not None:
+            cookie_cfg = settings.cookie_settings.copy()
+            cookie_cfg["max_age"] = settings.MONGO_MAX_STALENESS_SECONDS
+            response.set_cookie(
+                key=causal.COOKIE_NAME, value=token.encode(), **cookie_cfg
+            )
+        return response
@@ -0,0 +1,126 @@
+# utils/middleware/compression_middleware.py
+import gzip
+from typing import Optional
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+# Only JSON bodies are compressed; event streams must never be buffered
+COMPRESSIBLE_TYPES = ("application/json",)
+
+# Bodies above this size get a faster (lower) compression level
+LARGE_BODY_SIZE = 1024 * 1024
+
+
+def _levels(size: int) -> dict[str, int]:
+    """Compression level per encoding, trading ratio for CPU on large bodies."""
+    if size >= LARGE_BODY_SIZE:
+        return {"zstd": 3, "br": 4, "gzip": 4}
+    return {"zstd": 6, "br": 6, "gzip": 6}
+
+
+def _available_encodings() -> list[str]:
+    """Supported encodings, best first."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best encoding the client accepts (q > 0), or None."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in _available_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    level = _levels(len(body))[encoding]
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level)
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compress JSON responses with zstd, brotli or gzip, as negotiated."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        content_type = response.headers.get("content-type", "")
+        if (
+            encoding is None
+            or "content-encoding" in response.headers
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        compressed = len(body) >= settings.COMPRESSION_MIN_SIZE
+        if compressed and len(body) >= LARGE_BODY_SIZE:
+            # Don't hold up the event loop for multi-MB bodies
+            body = await run_in_threadpool(compress, body, encoding)
+        elif compressed:
+            body = compress(body, encoding)
+
+        new_response = Response(
+            content=body,
+            status_code=response.status_code,
+            background=response.background,
+        )
+        # Keep every original header (incl. repeated set-cookie) but the length
+        new_response.raw_headers = [
+            (key, value)
+            for key, value in response.raw_headers
+            if key != b"content-length"
+        ] + new_response.raw_headers
+
+        # Appends to a Vary already set, e.g. Vary: Origin from CORSMiddleware
+        new_response.headers.add_vary_header("Accept-Encoding")
+        if compressed:
+            new_response.headers["content-encoding"] = encoding
+            # A strong ETag must differ per representation
+            etag = new_response.headers.get("etag")
+            if etag and etag.endswith('"'):
+                new_response.headers["etag"] = f'{etag[:-1]}-{encoding}"'
+
+        return new_response
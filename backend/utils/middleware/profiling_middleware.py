@@ -0,0 +1,91 @@
+# utils/middleware/profiling_middleware.py
+import random
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import settings
+from utils.admin import ADMIN_TOKEN_HEADER, is_admin_token
+from utils.logger import get_logger
+from utils.middleware.streaming import is_event_stream_path
+from utils.profiling.profile_store import profile_store
+
+logger = get_logger(__name__)
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - pyinstrument is optional
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests with pyinstrument and store them for later.
+
+    A request is profiled when it carries `X-Profile: 1` together with a
+    valid `X-Admin-Token`, or when it is picked by PROFILING_SAMPLE_RATE.
+    Event streams are never profiled, since they stay open for minutes.
+    Profiled responses get a server-generated `X-Profile-Id` header; the
+    speedscope profile can then be fetched from GET /api/admin/profiles/{id}.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so a request that is not
+    profiled costs a path match, one header lookup and a random() call,
+    and its body is never re-wrapped.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def _should_profile(self, headers: Headers) -> bool:
+        if Profiler is None:
+            return False
+        if PROFILE_HEADER in headers and is_admin_token(
+            headers.get(ADMIN_TOKEN_HEADER, "")
+        ):
+            return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if is_event_stream_path(scope["path"]) or not self._should_profile(
+            Headers(scope=scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Never taken from the client, so no profile can be overwritten
+        request_id = uuid.uuid4().hex
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = request_id
+            await send(message)
+
+        # async_mode="enabled" attributes awaited time to this request only
+        profiler = Profiler(async_mode="enabled")
+        try:
+            profiler.start()
+        except RuntimeError as e:
+            logger.warning(f"Profiler unavailable for {scope['path']}: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            try:
+                await profile_store.save(
+                    request_id, session, scope["method"], scope["path"]
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to store profile {request_id}: {e}", exc_info=True
+                )
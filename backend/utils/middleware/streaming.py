@@ -0,0 +1,10 @@
+# utils/middleware/streaming.py
+import re
+
+# Server-Sent Events routes: /api/results/stream, /api/progress/{task_id}/events
+EVENT_STREAM_PATH = re.compile(r"^/api/(results/stream|progress/[^/]+/events)$")
+
+
+def is_event_stream_path(path: str) -> bool:
+    """True for routes whose responses stay open as event streams."""
+    return EVENT_STREAM_PATH.match(path) is not None
@@ -0,0 +1,102 @@
+"""
+Read-your-writes for secondary reads, across workers.
+
+Storing a result records the cluster and operation time of its session.
+CausalTokenMiddleware sends that token to the client in the COOKIE_NAME
+cookie, and reads it back on every later request, so whichever worker
+serves the user's next read first advances its session to that write.
+"""
+
+import base64
+from contextvars import ContextVar, Token
+from typing import Any, Mapping, NamedTuple, Optional
+
+import bson
+from bson.timestamp import Timestamp
+
+COOKIE_NAME = "causal_token"
+
+
+class CausalToken(NamedTuple):
+    """Cluster and operation time of a write, as reported by its session."""
+
+    cluster_time: Mapping[str, Any]
+    operation_time: Timestamp
+
+    def encode(self) -> str:
+        """Cookie value: the token as BSON, in unpadded URL-safe base64."""
+        raw = bson.encode(
+            {"cluster_time": self.cluster_time, "operation_time": self.operation_time}
+        )
+        # No "=" padding, which would make the cookie value quoted
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> Optional["CausalToken"]:
+        """Parse a cookie value; None if it is malformed."""
+        try:
+            doc = bson.decode(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+            token = cls(doc["cluster_time"], doc["operation_time"])
+        except Exception:
+            return None
+        if not isinstance(token.cluster_time, Mapping) or not isinstance(
+            token.operation_time, Timestamp
+        ):
+            return None
+        return token
+
+
+# Newest token the current request's reads wait for: the client's, or a
+# write made since in the same context
+current_causal_token: ContextVar[Optional[CausalToken]] = ContextVar(
+    "current_causal_token", default=None
+)
+
+# Writes of the current request, for the response's cookie. The list is
+# shared with the middleware, so appends from worker threads reach it.
+_request_writes: ContextVar[Optional[list[CausalToken]]] = ContextVar(
+    "causal_request_writes", default=None
+)
+
+
+def _newer(a: Optional[CausalToken], b: Optional[CausalToken]) -> Optional[CausalToken]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a.operation_time >= b.operation_time else b
+
+
+def newest(tokens: list[CausalToken]) -> Optional[CausalToken]:
+    latest = None
+    for token in tokens:
+        latest = _newer(latest, token)
+    return latest
+
+
+def set_request_tokens(
+    client_token: Optional[CausalToken], writes: list[CausalToken]
+) -> tuple[Token, Token]:
+    """Start a request's causal tracking; see CausalTokenMiddleware."""
+    return current_causal_token.set(client_token), _request_writes.set(writes)
+
+
+def reset_request_tokens(tokens: tuple[Token, Token]) -> None:
+    current_causal_token.reset(tokens[0])
+    _request_writes.reset(tokens[1])
+
+
+def record_write(session) -> None:
+    """Remember the causal position of a write made in `session`."""
+    if session.operation_time is None or session.cluster_time is None:
+        return
+    token = CausalToken(session.cluster_time, session.operation_time)
+    current_causal_token.set(_newer(current_causal_token.get(), token))
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.append(token)
+
+
+def latest_write() -> Optional[CausalToken]:
+    """Token a read in the current request has to wait for, if any."""
+    return _newer(current_causal_token.get(), newest(_request_writes.get() or []))
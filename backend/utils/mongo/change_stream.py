@@ -0,0 +1,259 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+
+from settings import settings
+from utils.logger import get_logger
+from utils.mongo.mongo_manager import db
+from utils.websocket.connection_manager import connection_manager
+
+logger = get_logger(__name__)
+
+# Server error code when the resume token has fallen off the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+# Fields pushed to clients; the (potentially huge) `external` payload is not sent
+SUMMARY_FIELDS = ("user_id", "task_id", "timestamp", "original_query", "service")
+
+# A worker holds its resume token slot for this long without renewing it
+SLOT_LEASE_SECONDS = 30
+SLOT_RENEW_INTERVAL = 10
+
+
+class ResultChangeStream:
+    """
+    Watches the results collection and pushes new results to subscribers.
+
+    One watcher runs per process on a background thread (pymongo's change
+    streams are blocking). Inserts are routed to the owning user's
+    WebSockets and to the asyncio queues its SSE streams subscribed with.
+    Each worker persists its resume token in a slot it leases, so a
+    restarted worker takes over a dead worker's slot and continues from
+    that position instead of another live worker's.
+
+    Change streams need a replica set; a single-node one is enough locally.
+    """
+
+    def __init__(self, collection_name: str, queue_size: int = 100) -> None:
+        self.collection_name = collection_name
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._slot: Optional[str] = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    # -------------------------------------------------
+    # Subscriptions (event loop side)
+    # -------------------------------------------------
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a connection for user_id and return the queue it reads from."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def _dispatch(self, user_id: str, result: dict[str, Any]) -> None:
+        # Every worker runs a watcher, so WebSockets only need local delivery
+        connection_manager.send_local(user_id, {"type": "result", "result": result})
+
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(result)
+            except asyncio.QueueFull:
+                # Slow reader: it will catch up from the listing endpoint
+                logger.warning(f"Dropping result event for slow subscriber {user_id}")
+
+    # -------------------------------------------------
+    # Watcher lifecycle
+    # -------------------------------------------------
+
+    def start(self) -> None:
+        """Start the watcher thread; must be called from the running event loop."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="result-change-stream", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Change stream watcher started on {self.collection_name}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Change stream watcher stopped")
+
+    # -------------------------------------------------
+    # Resume token persistence
+    # -------------------------------------------------
+
+    def _state_collection(self):
+        return db.get_db()[settings.CHANGE_STREAM_STATE_COLLECTION]
+
+    def _lease(self) -> list[dict]:
+        # Server clock, so leases compare the same from every host
+        return [
+            {
+                "$set": {
+                    "owner": self._owner,
+                    "lease_until": {"$add": ["$$NOW", SLOT_LEASE_SECONDS * 1000]},
+                }
+            }
+        ]
+
+    def _claim_slot(self) -> str:
+        """Lease the first slot that is free or whose owner stopped renewing it."""
+        expired = {
+            "$or": [
+                {"owner": self._owner},
+                {"$expr": {"$lt": ["$lease_until", "$$NOW"]}},
+            ]
+        }
+        slot = 0
+        while True:
+            key = f"{self.collection_name}:{slot}"
+            try:
+                self._state_collection().update_one(
+                    {"_id": key, **expired}, self._lease(), upsert=True
+                )
+                logger.info(f"Change stream watcher holds slot {key}")
+                return key
+            except DuplicateKeyError:
+                # Slot exists and is leased by a live worker
+                slot += 1
+
+    def _renew_slot(self) -> bool:
+        """Extend the lease; False if another worker has taken the slot over."""
+        result = self._state_collection().update_one(
+            {"_id": self._slot, "owner": self._owner}, self._lease()
+        )
+        if result.matched_count == 0:
+            logger.warning(f"Lost change stream slot {self._slot}")
+            self._slot = None
+            return False
+        return True
+
+    def _release_slot(self) -> None:
+        """Let a replacement worker take the slot over right away."""
+        if self._slot is None:
+            return
+        try:
+            self._state_collection().update_one(
+                {"_id": self._slot, "owner": self._owner},
+                [{"$set": {"lease_until": "$$NOW"}}],
+            )
+        except PyMongoError as e:
+            logger.warning(f"Failed to release change stream slot: {e}")
+        self._slot = None
+
+    def _load_resume_token(self) -> Optional[dict]:
+        state = self._state_collection().find_one({"_id": self._slot})
+        return state.get("resume_token") if state else None
+
+    def _save_resume_token(self, token: Optional[dict]) -> None:
+        if token is None:
+            return
+        self._state_collection().update_one(
+            {"_id": self._slot, "owner": self._owner},
+            {"$set": {"resume_token": token}},
+        )
+
+    def _clear_resume_token(self) -> None:
+        self._state_collection().update_one(
+            {"_id": self._slot, "owner": self._owner},
+            {"$unset": {"resume_token": ""}},
+        )
+
+    # -------------------------------------------------
+    # Watch loop (background thread)
+    # -------------------------------------------------
+
+    def _pipeline(self) -> list[dict]:
+        return [
+            {"$match": {"operationType": "insert"}},
+            {"$project": {f"fullDocument.{f}": 1 for f in SUMMARY_FIELDS}},
+        ]
+
+    def _run(self) -> None:
+        try:
+            self._watch_loop()
+        finally:
+            self._release_slot()
+
+    def _watch_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._slot is None:
+                    self._slot = self._claim_slot()
+                self._watch()
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    logger.warning("Resume token is too old, watching from now")
+                    self._clear_resume_token()
+                    continue
+                logger.error(f"Change stream failed: {e}", exc_info=True)
+            except PyMongoError as e:
+                logger.error(f"Change stream failed: {e}", exc_info=True)
+            # Back off before reconnecting
+            self._stop.wait(5)
+
+    def _watch(self) -> None:
+        collection = db.get_db()[self.collection_name]
+        with collection.watch(
+            self._pipeline(),
+            resume_after=self._load_resume_token(),
+            max_await_time_ms=1000,
+        ) as stream:
+            # The stream's resume token also advances on idle getMores, so
+            # only persist it once a change has actually been handled
+            pending, saved_at = False, time.monotonic()
+            renewed_at = time.monotonic()
+            while not self._stop.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    self._handle(change)
+                    pending = True
+
+                # Persist the position when idle, or at most once a second
+                if pending and (change is None or time.monotonic() - saved_at >= 1):
+                    self._save_resume_token(stream.resume_token)
+                    pending, saved_at = False, time.monotonic()
+
+                if time.monotonic() - renewed_at >= SLOT_RENEW_INTERVAL:
+                    if not self._renew_slot():
+                        return
+                    renewed_at = time.monotonic()
+
+            if pending:
+                self._save_resume_token(stream.resume_token)
+
+    def _handle(self, change: dict) -> None:
+        document = change.get("fullDocument") or {}
+        user_id = document.get("user_id")
+        if not user_id or self._loop is None:
+            return
+        result = {field: document.get(field) for field in SUMMARY_FIELDS}
+        self._loop.call_soon_threadsafe(self._dispatch, user_id, result)
+
+
+result_change_stream = ResultChangeStream(settings.RESULT_COLLECTION)
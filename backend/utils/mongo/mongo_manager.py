@@ -1,13 +1,27 @@
-from typing import Any, Optional
-
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, Optional
+
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.max_key import MaxKey
+from bson.min_key import MinKey
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
+from pymongo.client_session import ClientSession
 from pymongo.errors import ConnectionFailure
+from pymongo.read_preferences import SecondaryPreferred
 
 from settings import settings
 from utils.logger import get_logger
+from utils.mongo import causal
+from utils.mongo.payload_store import REF_FIELD, PayloadStore
+from utils.resilience.dependency import DependencyUnavailableError, mongo_dependency
 
 logger = get_logger(__name__)
 
+# Leave documents as BSON bytes; fields are decoded only when accessed
+RAW_CODEC = CodecOptions(document_class=RawBSONDocument)
+
 
 class MongoDB:
     """Mongo DB conection handler."""
@@ -15,6 +29,7 @@ class MongoDB:
     def __init__(self) -> None:
         self.mongo_client: Optional[MongoClient] = None
         self.db = None
+        self.payload_store: Optional[PayloadStore] = None
 
     def _get_mongo_client(self) -> MongoClient:
         if self.mongo_client is None:
@@ -33,6 +48,63 @@ class MongoDB:
 
         return self.db
 
+    def get_payload_store(self) -> PayloadStore:
+        if self.payload_store is None:
+            self.payload_store = PayloadStore(self.get_db())
+
+        return self.payload_store
+
+    def _read_collection(self, collection_name: str, **options):
+        """
+        Collection handle for the read-only query methods.
+
+        With MONGO_SECONDARY_READS_ENABLED these reads go to a secondary no
+        more than MONGO_MAX_STALENESS_SECONDS behind (or the primary if
+        none qualifies). Everything else, including create_or_get_user and
+        all writes, keeps the client default: the primary.
+        """
+        if settings.MONGO_SECONDARY_READS_ENABLED:
+            options["read_preference"] = SecondaryPreferred(
+                max_staleness=settings.MONGO_MAX_STALENESS_SECONDS
+            )
+        collection = self.get_db()[collection_name]
+        return collection.with_options(**options) if options else collection
+
+    @contextmanager
+    def _read_session(self) -> Iterator[Optional[ClientSession]]:
+        """
+        Causally consistent session for a user's secondary reads.
+
+        The session is advanced to the newest write the request knows of,
+        from the client's causal token or made earlier in the same request
+        (see utils.mongo.causal). The secondary waits until it has applied
+        that write before answering: users see their own new results.
+        """
+        if not settings.MONGO_SECONDARY_READS_ENABLED:
+            yield None
+            return
+
+        with self._get_mongo_client().start_session(causal_consistency=True) as session:
+            token = causal.latest_write()
+            if token is not None:
+                session.advance_cluster_time(token.cluster_time)
+                session.advance_operation_time(token.operation_time)
+            yield session
+
+    def ping(self) -> None:
+        """Open the connection pool eagerly so the first request doesn't pay for it."""
+        self.get_db().command("ping")
+        logger.info("MongoDB connection warmed up")
+
+    def close(self) -> None:
+        """Close the client; a later call to get_db() reconnects lazily."""
+        if self.mongo_client is not None:
+            self.mongo_client.close()
+            logger.info("MongoDB connection closed")
+        self.mongo_client = None
+        self.db = None
+        self.payload_store = None
+
     def insert_one(
         self,
         data: dict[str, Any],
@@ -40,15 +112,76 @@ class MongoDB:
     ) -> Optional[str]:
         db = self.get_db()
         try:
-            collection = db[collection_name]
-            result = collection.insert_one(data)
-            logger.info(f"one result inserted, id: {result.inserted_id}")
-            logger.info("data updation to nongo db successful")
-            return result.inserted_id
+            with mongo_dependency.call():
+                collection = db[collection_name]
+                if collection_name != settings.RESULT_COLLECTION:
+                    result = collection.insert_one(data)
+                    logger.info(f"one result inserted, id: {result.inserted_id}")
+                    logger.info("data updation to nongo db successful")
+                    return result.inserted_id
+
+                # Large analysis payloads are stored out of line
+                payload_store = self.get_payload_store()
+                data = payload_store.offload(dict(data))
+                with self._get_mongo_client().start_session(
+                    causal_consistency=True
+                ) as session:
+                    try:
+                        result = collection.insert_one(data, session=session)
+                    except Exception:
+                        # Nothing references the offloaded payload without the result
+                        payload_store.discard(data)
+                        raise
+                    logger.info(f"one result inserted, id: {result.inserted_id}")
+                    logger.info("data updation to nongo db successful")
+                    self._update_result_aggregate(data, session=session)
+
+        except DependencyUnavailableError:
+            raise
+
         except Exception as e:
             print(e)
             return None
 
+        # The result is stored; a failure here must not report a failed write.
+        # The session's cluster/operation time stay readable after it ends.
+        try:
+            # Lets the user's next secondary reads wait for this write
+            causal.record_write(session)
+        except Exception as e:
+            logger.error(f"Error recording causal token: {e}", exc_info=True)
+        return result.inserted_id
+
+    def find_user(
+        self,
+        firebase_uid: str,
+        collection_name: str,
+    ) -> Optional[dict]:
+        """
+        Find a user document by Firebase UID, on the primary.
+
+        Args:
+            firebase_uid: Firebase user identifier
+            collection_name: Name of the user collection
+
+        Returns:
+            User document, or None if not found or on error
+        """
+        db = self.get_db()
+        try:
+            with mongo_dependency.call():
+                return db[collection_name].find_one({"firebase_uid": firebase_uid})
+
+        except DependencyUnavailableError:
+            raise
+
+        except Exception as e:
+            logger.error(
+                f"Error finding user {firebase_uid}: {e}",
+                exc_info=True,
+            )
+            return None
+
     def find_all_results_by_service(
         self,
         user_id: str,
@@ -66,28 +199,33 @@ class MongoDB:
         Returns:
             List of documents with user_id, task_id, timestamp, original_query, or None on error
         """
-        db = self.get_db()
         try:
-            collection = db[collection_name]
-
-            # Find all documents matching user_id and service, sorted by timestamp (newest first)
-            results = list(
-                collection.find(
-                    {"user_id": user_id, "service": service},
-                    projection={
-                        "user_id": 1,
-                        "task_id": 1,
-                        "timestamp": 1,
-                        "original_query": 1,
-                        "service": 1,
-                    },
-                ).sort("timestamp", -1)
-            )
-
-            logger.info(
-                f"Found {len(results)} documents for user {user_id} and service {service}"
-            )
-            return results
+            with mongo_dependency.call():
+                collection = self._read_collection(collection_name)
+
+                # Find all documents matching user_id and service, sorted by timestamp (newest first)
+                with self._read_session() as session:
+                    results = list(
+                        collection.find(
+                            {"user_id": user_id, "service": service},
+                            projection={
+                                "user_id": 1,
+                                "task_id": 1,
+                                "timestamp": 1,
+                                "original_query": 1,
+                                "service": 1,
+                            },
+                            session=session,
+                        ).sort("timestamp", -1)
+                    )
+
+                logger.info(
+                    f"Found {len(results)} documents for user {user_id} and service {service}"
+                )
+                return results
+
+        except DependencyUnavailableError:
+            raise
 
         except Exception as e:
             logger.error(
@@ -111,26 +249,31 @@ class MongoDB:
         Returns:
             List of documents with user_id, task_id, timestamp, original_query, or None on error
         """
-        db = self.get_db()
         try:
-            collection = db[collection_name]
-
-            # Find all documents matching user_id and service, sorted by timestamp (newest first)
-            results = list(
-                collection.find(
-                    {"user_id": user_id},
-                    projection={
-                        "user_id": 1,
-                        "task_id": 1,
-                        "timestamp": 1,
-                        "original_query": 1,
-                        "service": 1,
-                    },
-                ).sort("timestamp", -1)
-            )
-
-            logger.info(f"Found {len(results)} documents for user {user_id}")
-            return results
+            with mongo_dependency.call():
+                collection = self._read_collection(collection_name)
+
+                # Find all documents matching user_id and service, sorted by timestamp (newest first)
+                with self._read_session() as session:
+                    results = list(
+                        collection.find(
+                            {"user_id": user_id},
+                            projection={
+                                "user_id": 1,
+                                "task_id": 1,
+                                "timestamp": 1,
+                                "original_query": 1,
+                                "service": 1,
+                            },
+                            session=session,
+                        ).sort("timestamp", -1)
+                    )
+
+                logger.info(f"Found {len(results)} documents for user {user_id}")
+                return results
+
+        except DependencyUnavailableError:
+            raise
 
         except Exception as e:
             logger.error(
@@ -156,37 +299,333 @@ class MongoDB:
         Returns:
             Document with service, user_id, task_id, timestamp, original_query, external, or None if not found
         """
-        db = self.get_db()
         try:
-            collection = db[collection_name]
-
-            # Find document matching user_id and task_id
-            result = collection.find_one(
-                {"user_id": user_id, "task_id": task_id},
-                projection={
-                    "service": 1,
-                    "user_id": 1,
-                    "task_id": 1,
-                    "timestamp": 1,
-                    "original_query": 1,
-                    "external": 1,
-                },
+            with mongo_dependency.call():
+                # Find document matching user_id and task_id
+                collection = self._read_collection(collection_name)
+                result = self._find_task_document(
+                    collection, collection_name, user_id, task_id
+                )
+
+                if result:
+                    logger.info(f"Found document for user {user_id} and task {task_id}")
+                else:
+                    logger.info(
+                        f"No document found for user {user_id} and task {task_id}"
+                    )
+                    return result
+
+                # Resolve a payload stored out of line (see PayloadStore)
+                ref = result.pop(REF_FIELD, None)
+                if ref:
+                    result["external"] = self.get_payload_store().load(ref)
+
+                return result
+
+        except DependencyUnavailableError:
+            raise
+
+        except Exception as e:
+            logger.error(
+                f"Error finding document for user {user_id} and task {task_id}: {e}",
+                exc_info=True,
             )
+            return None
+
+    def _find_task_document(
+        self,
+        collection,
+        collection_name: str,
+        user_id: str,
+        task_id: str,
+    ):
+        """
+        find_one for a task result, falling back to the archive tier.
+        """
+        query = {"user_id": user_id, "task_id": task_id}
+        projection = {
+            "service": 1,
+            "user_id": 1,
+            "task_id": 1,
+            "timestamp": 1,
+            "original_query": 1,
+            "external": 1,
+            REF_FIELD: 1,
+        }
+
+        with self._read_session() as session:
+            result = collection.find_one(query, projection=projection, session=session)
+            if result is None and collection_name == settings.RESULT_COLLECTION:
+                archive = self._read_collection(
+                    settings.RESULT_ARCHIVE_COLLECTION,
+                    codec_options=collection.codec_options,
+                )
+                result = archive.find_one(query, projection=projection, session=session)
+
+        return result
+
+    def get_results_version(
+        self,
+        user_id: str,
+        collection_name: str,
+        service: Optional[str] = None,
+        task_id: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Cheap fingerprint of a user's result set, used to build ETags.
 
-            if result:
-                logger.info(f"Found document for user {user_id} and task {task_id}")
-            else:
-                logger.info(f"No document found for user {user_id} and task {task_id}")
+        Runs a count plus a newest-first find_one on the same filters (and
+        indexes) as the listing queries, without fetching any documents.
 
-            return result
+        Args:
+            user_id: User identifier
+            collection_name: Name of the collection
+            service: Restrict to one service, as find_all_results_by_service
+            task_id: Restrict to one task, as find_result_by_task
+
+        Returns:
+            Dict with count, latest_id and latest_timestamp, or None on error
+        """
+        try:
+            with mongo_dependency.call():
+                collection = self._read_collection(collection_name)
+
+                query: dict[str, Any] = {"user_id": user_id}
+                if service is not None:
+                    query["service"] = service
+                if task_id is not None:
+                    query["task_id"] = task_id
+
+                with self._read_session() as session:
+                    count = collection.count_documents(query, session=session)
+                    latest = collection.find_one(
+                        query,
+                        projection={"_id": 1, "timestamp": 1},
+                        sort=[("timestamp", -1)],
+                        session=session,
+                    )
+
+                return {
+                    "count": count,
+                    "latest_id": latest.get("_id") if latest else None,
+                    "latest_timestamp": latest.get("timestamp") if latest else None,
+                }
+
+        except DependencyUnavailableError:
+            raise
 
         except Exception as e:
             logger.error(
-                f"Error finding document for user {user_id} and task {task_id}: {e}",
+                f"Error computing results version for user {user_id}: {e}",
+                exc_info=True,
+            )
+            return None
+
+    def find_raw_result_by_task(
+        self,
+        user_id: str,
+        task_id: str,
+        collection_name: str,
+    ) -> Optional[Mapping[str, Any]]:
+        """
+        Find a document by user_id and task_id without decoding it.
+
+        Same query as find_result_by_task, but the document comes back as a
+        RawBSONDocument: only the top-level fields that are actually read
+        get decoded, and the `external` subdocument stays raw BSON until
+        it is serialized (see utils.responses.RawResultResponse).
+
+        Args:
+            user_id: User identifier
+            task_id: Task identifier
+            collection_name: Name of the collection
+
+        Returns:
+            Raw document with service, user_id, task_id, timestamp, original_query, external, or None if not found
+        """
+        try:
+            with mongo_dependency.call():
+                collection = self._read_collection(
+                    collection_name, codec_options=RAW_CODEC
+                )
+
+                result = self._find_task_document(
+                    collection, collection_name, user_id, task_id
+                )
+
+                if result:
+                    logger.info(
+                        f"Found raw document for user {user_id} and task {task_id}"
+                    )
+                else:
+                    logger.info(
+                        f"No document found for user {user_id} and task {task_id}"
+                    )
+                    return result
+
+                ref = result.get(REF_FIELD)
+                if ref:
+                    # The stub document is small; swap in the payload, still raw
+                    result = dict(result)
+                    result.pop(REF_FIELD)
+                    result["external"] = self.get_payload_store().load_raw(ref)
+
+                return result
+
+        except DependencyUnavailableError:
+            raise
+
+        except Exception as e:
+            logger.error(
+                f"Error finding raw document for user {user_id} and task {task_id}: {e}",
+                exc_info=True,
+            )
+            return None
+
+    # -------------------------------------------------
+    # Per-user, per-service result aggregates
+    # -------------------------------------------------
+
+    @staticmethod
+    def _aggregate_key(user_id: str, service: Any) -> dict[str, Any]:
+        # Field order matters for matching embedded _id documents
+        return {"user_id": user_id, "service": service}
+
+    def _update_result_aggregate(
+        self,
+        data: Mapping[str, Any],
+        session: Optional[ClientSession] = None,
+    ) -> None:
+        """
+        Fold one newly stored result into its (user_id, service) aggregate.
+
+        A failure here is logged but does not fail the insert; the next
+        rebuild_result_aggregates run corrects the counts.
+        """
+        try:
+            update: dict[str, Any] = {
+                "$inc": {"count": 1, "total_tokens": data.get("total_tokens") or 0},
+                # Server clock, like rebuild_result_aggregates
+                "$currentDate": {"updated_at": True},
+            }
+            if data.get("timestamp") is not None:
+                update["$max"] = {"latest_timestamp": data["timestamp"]}
+
+            self.get_db()[settings.RESULT_AGGREGATE_COLLECTION].update_one(
+                {"_id": self._aggregate_key(data["user_id"], data["service"])},
+                update,
+                upsert=True,
+                session=session,
+            )
+        except Exception as e:
+            logger.error(f"Error updating result aggregate: {e}", exc_info=True)
+
+    def get_result_aggregates(
+        self,
+        user_id: str,
+    ) -> Optional[dict[str, dict]]:
+        """
+        Result counts and last activity of a user, per service.
+
+        One range scan over the `_id` index of the aggregate collection,
+        instead of listing every result of every service.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Dict of service -> {count, latest_timestamp, total_tokens} for
+            services with at least one result, newest activity first, or
+            None on error
+        """
+        try:
+            with mongo_dependency.call():
+                collection = self._read_collection(settings.RESULT_AGGREGATE_COLLECTION)
+
+                # Embedded _ids compare field by field, so every service of
+                # the user sorts between MinKey and MaxKey
+                query = {
+                    "_id": {
+                        "$gt": self._aggregate_key(user_id, MinKey()),
+                        "$lt": self._aggregate_key(user_id, MaxKey()),
+                    }
+                }
+                with self._read_session() as session:
+                    aggregates = {
+                        doc["_id"]["service"]: {
+                            "count": doc.get("count", 0),
+                            "latest_timestamp": doc.get("latest_timestamp"),
+                            "total_tokens": doc.get("total_tokens", 0),
+                        }
+                        for doc in collection.find(query, session=session).sort(
+                            "latest_timestamp", -1
+                        )
+                    }
+
+                logger.info(
+                    f"Found result aggregates for {len(aggregates)} services of user {user_id}"
+                )
+                return aggregates
+
+        except DependencyUnavailableError:
+            raise
+
+        except Exception as e:
+            logger.error(
+                f"Error finding result aggregates for user {user_id}: {e}",
                 exc_info=True,
             )
             return None
 
+    def rebuild_result_aggregates(self) -> int:
+        """
+        Recompute every aggregate from the results and their archive.
+
+        Runs server-side as one $group + $merge pipeline, replacing the
+        stored aggregates and tagging them with a run id, then drops
+        aggregates whose results are all gone.
+        Inserts that land while the pipeline runs may be counted twice or
+        not at all until the next rebuild.
+
+        Returns:
+            Number of aggregates removed as stale
+        """
+        db = self.get_db()
+        run_id = ObjectId()
+        # Server clock, which also stamps updated_at; the client's may differ
+        started = db.command("hello")["localTime"]
+
+        db[settings.RESULT_COLLECTION].aggregate(
+            [
+                {"$unionWith": settings.RESULT_ARCHIVE_COLLECTION},
+                {
+                    "$group": {
+                        "_id": {"user_id": "$user_id", "service": "$service"},
+                        "count": {"$sum": 1},
+                        "latest_timestamp": {"$max": "$timestamp"},
+                        "total_tokens": {"$sum": {"$ifNull": ["$total_tokens", 0]}},
+                    }
+                },
+                {"$set": {"updated_at": "$$NOW", "run_id": run_id}},
+                {
+                    "$merge": {
+                        "into": settings.RESULT_AGGREGATE_COLLECTION,
+                        "on": "_id",
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+        )
+
+        # Aggregates neither produced by this run nor updated since are stale
+        stale = db[settings.RESULT_AGGREGATE_COLLECTION].delete_many(
+            {"run_id": {"$ne": run_id}, "updated_at": {"$lt": started}}
+        )
+
+        logger.info(f"Rebuilt result aggregates, removed {stale.deleted_count} stale")
+        return stale.deleted_count
+
 
 db = MongoDB()
 logger.info("MongoDB created")
@@ -0,0 +1,209 @@
+import zlib
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+import bson
+from bson import Binary, ObjectId
+from bson.raw_bson import RawBSONDocument
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+from pymongo import ReplaceOne
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+# Marker stored in place of an offloaded `external` payload
+REF_FIELD = "external_ref"
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this payload")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class PayloadStore:
+    """
+    Out-of-line storage for large result payloads (`external`).
+
+    Results store the full LLM/Tavily output inline, which bloats the
+    documents the listing queries scan. Payloads whose BSON size exceeds
+    RESULT_PAYLOAD_INLINE_LIMIT are compressed and moved out:
+
+    - into RESULT_PAYLOAD_COLLECTION as one document, or
+    - into the RESULT_PAYLOAD_BUCKET GridFS bucket when even the compressed
+      payload is above RESULT_PAYLOAD_GRIDFS_THRESHOLD.
+
+    The result document keeps a small `external_ref` instead, which only
+    find_result_by_task resolves.
+    """
+
+    def __init__(self, database) -> None:
+        self.database = database
+
+    @property
+    def collection(self):
+        return self.database[settings.RESULT_PAYLOAD_COLLECTION]
+
+    @property
+    def bucket(self) -> GridFSBucket:
+        return GridFSBucket(self.database, bucket_name=settings.RESULT_PAYLOAD_BUCKET)
+
+    @staticmethod
+    def encode(external: Any) -> Optional[tuple[str, bytes, int]]:
+        """
+        Compress a payload if it is too large to keep inline.
+
+        Returns:
+            (codec, compressed bytes, raw size), or None to keep it inline
+        """
+        raw = bson.encode({"v": external})
+        if len(raw) <= settings.RESULT_PAYLOAD_INLINE_LIMIT:
+            return None
+        codec, data = _compress(raw)
+        return codec, data, len(raw)
+
+    def offload(self, document: dict[str, Any]) -> dict[str, Any]:
+        """Move document["external"] out of line if needed; returns the document."""
+        if document.get("external") is None:
+            return document
+
+        encoded = self.encode(document["external"])
+        if encoded is None:
+            return document
+        codec, data, raw_size = encoded
+
+        payload_id = ObjectId()
+        if len(data) > settings.RESULT_PAYLOAD_GRIDFS_THRESHOLD:
+            self.bucket.upload_from_stream_with_id(
+                payload_id, str(payload_id), data, metadata={"codec": codec}
+            )
+            store = "gridfs"
+        else:
+            self.collection.insert_one(
+                {"_id": payload_id, "codec": codec, "data": Binary(data)}
+            )
+            store = "collection"
+
+        logger.info(
+            f"Offloaded {raw_size} byte payload to {store} "
+            f"({len(data)} bytes {codec})"
+        )
+        document["external"] = None
+        document[REF_FIELD] = {
+            "store": store,
+            "id": payload_id,
+            "codec": codec,
+            "size": raw_size,
+        }
+        return document
+
+    def _read(self, ref: dict[str, Any]) -> bytes:
+        if ref["store"] == "gridfs":
+            data = self.bucket.open_download_stream(ref["id"]).read()
+        else:
+            stored = self.collection.find_one({"_id": ref["id"]})
+            if stored is None:
+                raise LookupError(f"Result payload {ref['id']} is missing")
+            data = stored["data"]
+        return _decompress(ref["codec"], data)
+
+    def load(self, ref: dict[str, Any]) -> Any:
+        """Fetch and decode an offloaded payload."""
+        return bson.decode(self._read(ref))["v"]
+
+    def load_raw(self, ref: dict[str, Any]) -> Any:
+        """Fetch an offloaded payload, leaving it as raw BSON."""
+        return RawBSONDocument(self._read(ref))["v"]
+
+    def delete(self, ref: dict[str, Any]) -> None:
+        """Delete an offloaded payload; one that is already gone is ignored."""
+        if ref["store"] == "gridfs":
+            try:
+                self.bucket.delete(ref["id"])
+            except NoFile:
+                logger.warning(f"Result payload {ref['id']} was already deleted")
+        else:
+            self.collection.delete_one({"_id": ref["id"]})
+
+    def discard(self, document: dict[str, Any]) -> None:
+        """Delete the payload offload() moved out of a document that was never stored."""
+        ref = document.get(REF_FIELD)
+        if not ref:
+            return
+        try:
+            self.delete(ref)
+        except Exception as e:
+            logger.error(f"Failed to delete orphaned payload {ref['id']}: {e}")
+
+    # -------------------------------------------------
+    # Archival policy
+    # -------------------------------------------------
+
+    def archive_results(self, older_than_days: int, batch_size: int = 500) -> int:
+        """
+        Move results older than the given age to RESULT_ARCHIVE_COLLECTION.
+
+        Payload references stay valid, so archived results can still be
+        read with find_result_by_task.
+
+        Returns:
+            Number of results archived
+        """
+        hot = self.database[settings.RESULT_COLLECTION]
+        cold = self.database[settings.RESULT_ARCHIVE_COLLECTION]
+        cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+
+        archived = 0
+        while True:
+            batch = list(hot.find({"timestamp": {"$lt": cutoff}}).limit(batch_size))
+            if not batch:
+                break
+            # Upsert by _id so a batch interrupted before the delete can be rerun
+            cold.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch],
+                ordered=False,
+            )
+            hot.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+            archived += len(batch)
+
+        logger.info(f"Archived {archived} results older than {older_than_days} days")
+        return archived
+
+    def purge_archived_results(self, older_than_days: int) -> int:
+        """
+        Delete archived results older than the given age, with their payloads.
+
+        Returns:
+            Number of results deleted
+        """
+        cold = self.database[settings.RESULT_ARCHIVE_COLLECTION]
+        cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+        query = {"timestamp": {"$lt": cutoff}}
+
+        purged = 0
+        for doc in cold.find(query, projection={REF_FIELD: 1}):
+            if doc.get(REF_FIELD):
+                self.delete(doc[REF_FIELD])
+            cold.delete_one({"_id": doc["_id"]})
+            purged += 1
+
+        logger.info(
+            f"Purged {purged} archived results older than {older_than_days} days"
+        )
+        return purged
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from pymongo import UpdateOne
+
+from settings import settings
+from utils.logger import get_logger
+from utils.mongo.mongo_manager import db
+
+logger = get_logger(__name__)
+
+
+class ActivityBuffer:
+    """
+    Write-behind buffer for per-user activity timestamps (e.g. last_login).
+
+    Repeated logins of the same user between flushes collapse into one
+    pending value per field, and every ACTIVITY_FLUSH_INTERVAL seconds all
+    pending values are written with a single unordered bulk_write. Updates
+    use $max, so flushes from several workers never move a timestamp
+    backwards. Pending values are flushed on graceful shutdown; a crash
+    loses at most one interval of activity timestamps.
+    """
+
+    def __init__(self) -> None:
+        # (collection_name, firebase_uid) -> {field: latest timestamp}
+        self._pending: dict[tuple[str, str], dict[str, datetime]] = defaultdict(dict)
+        # record() is called from worker threads (see create_or_get_user)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ACTIVITY_FLUSH_INTERVAL > 0
+
+    def record(
+        self,
+        collection_name: str,
+        firebase_uid: str,
+        field: str,
+        value: datetime,
+    ) -> None:
+        with self._lock:
+            fields = self._pending[(collection_name, firebase_uid)]
+            current = fields.get(field)
+            if current is None or value > current:
+                fields[field] = value
+
+    def flush(self) -> int:
+        """Write all pending timestamps. Returns the number of documents updated."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(dict)
+        if not pending:
+            return 0
+
+        by_collection: dict[str, list[UpdateOne]] = defaultdict(list)
+        for (collection_name, firebase_uid), fields in pending.items():
+            by_collection[collection_name].append(
+                UpdateOne({"firebase_uid": firebase_uid}, {"$max": fields})
+            )
+
+        flushed = 0
+        for collection_name, operations in by_collection.items():
+            try:
+                result = db.get_db()[collection_name].bulk_write(
+                    operations, ordered=False
+                )
+                flushed += result.modified_count
+            except Exception as e:
+                logger.error(
+                    f"Activity flush to {collection_name} failed: {e}", exc_info=True
+                )
+                # Put the values back so the next flush retries them
+                for (name, firebase_uid), fields in pending.items():
+                    if name == collection_name:
+                        for field, value in fields.items():
+                            self.record(name, firebase_uid, field, value)
+
+        logger.info(f"Flushed activity timestamps for {flushed} users")
+        return flushed
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.ACTIVITY_FLUSH_INTERVAL)
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info("Activity write-behind buffer started")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+
+activity_buffer = ActivityBuffer()
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import re
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Optional
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Request IDs become file names; also checked on lookup
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ProfileStore:
+    """
+    Speedscope profiles of single requests, one JSON file per request ID.
+
+    Files live in PROFILE_DIR, shared by all workers of a container; only
+    the newest PROFILE_RETENTION profiles are kept. Open a profile at
+    https://www.speedscope.app.
+    """
+
+    @property
+    def directory(self) -> Path:
+        return Path(settings.PROFILE_DIR)
+
+    @staticmethod
+    def valid_id(request_id: str) -> bool:
+        return bool(REQUEST_ID_PATTERN.match(request_id))
+
+    def _path(self, request_id: str) -> Path:
+        return self.directory / f"{request_id}.speedscope.json"
+
+    def _write(self, request_id: str, session, method: str, path: str) -> None:
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        profile = json.loads(SpeedscopeRenderer().render(session))
+        profile["name"] = f"{method} {path} ({request_id})"
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(request_id).write_text(json.dumps(profile))
+        logger.info(
+            f"Stored profile {request_id} for {method} {path} "
+            f"({session.duration * 1000:.0f}ms)"
+        )
+        self._prune()
+
+    def _newest_first(self) -> list[tuple[Path, os.stat_result]]:
+        """Profile files with their stat, newest first."""
+        files = []
+        for f in self.directory.glob("*.speedscope.json"):
+            try:
+                files.append((f, f.stat()))
+            except FileNotFoundError:
+                # Pruned by another worker since the glob
+                continue
+        return sorted(files, key=lambda item: item[1].st_mtime, reverse=True)
+
+    def _prune(self) -> None:
+        for stale, _ in self._newest_first()[settings.PROFILE_RETENTION :]:
+            stale.unlink(missing_ok=True)
+
+    async def save(self, request_id: str, session, method: str, path: str) -> None:
+        """Render and write a pyinstrument session off the event loop."""
+        await asyncio.to_thread(self._write, request_id, session, method, path)
+
+    def load(self, request_id: str) -> Optional[bytes]:
+        """Speedscope JSON of a profiled request, or None if unknown."""
+        if not self.valid_id(request_id):
+            return None
+        try:
+            return self._path(request_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        """Newest profiles first, as {request_id, created_at, size}."""
+        if not self.directory.exists():
+            return []
+        return [
+            {
+                "request_id": f.name.removesuffix(".speedscope.json"),
+                "created_at": datetime.fromtimestamp(stat.st_mtime, UTC),
+                "size": stat.st_size,
+            }
+            for f, stat in self._newest_first()[:limit]
+        ]
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional
+    aioredis = None
+
+
+class RedisManager:
+    """Redis connection handler (asyncio client, created lazily)."""
+
+    def __init__(self) -> None:
+        self.client: Optional["aioredis.Redis"] = None
+
+    @property
+    def available(self) -> bool:
+        return aioredis is not None
+
+    def get_client(self) -> "aioredis.Redis":
+        if self.client is None:
+            if aioredis is None:
+                raise RuntimeError("redis is not installed")
+            self.client = aioredis.from_url(
+                settings.REDIS_URL.get_secret_value(),
+                decode_responses=True,
+            )
+            logger.info("Redis client created")
+
+        return self.client
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            logger.info("Redis connection closed")
+        self.client = None
+
+
+redis_manager = RedisManager()
@@ -0,0 +1,326 @@
+import asyncio
+import contextvars
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from firebase_admin import auth
+from pymongo.errors import DuplicateKeyError
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class DependencyUnavailableError(Exception):
+    """A call to a dependency was rejected, or given up on after its deadline."""
+
+    def __init__(self, dependency: str, reason: str, retry_after: float) -> None:
+        super().__init__(f"{dependency} unavailable: {reason}")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Value for a Retry-After header (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class CircuitOpenError(DependencyUnavailableError):
+    """The dependency's circuit breaker is open."""
+
+
+class BulkheadFullError(DependencyUnavailableError):
+    """The dependency already has its maximum number of calls in flight."""
+
+
+class DependencyTimeoutError(DependencyUnavailableError):
+    """The call was attempted but did not finish within its deadline."""
+
+    def __init__(self, dependency: str, timeout: float) -> None:
+        super().__init__(dependency, f"no answer within {timeout:g}s", timeout)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    closed:    calls go through; BREAKER_FAILURE_THRESHOLD failures in a
+               row open the circuit.
+    open:      calls are rejected for BREAKER_RECOVERY_TIMEOUT seconds.
+    half_open: a single probe call goes through; its success closes the
+               circuit, its failure opens it again.
+
+    Thread-safe, since MongoDB calls run in worker threads.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._remaining_open() <= 0:
+                return self.HALF_OPEN
+            return self._state
+
+    def _remaining_open(self) -> float:
+        return settings.BREAKER_RECOVERY_TIMEOUT - (time.monotonic() - self._opened_at)
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit breaker {self.name} opened after {self._failures} failures"
+        )
+
+    def before_call(self) -> bool:
+        """
+        Admit a call or raise CircuitOpenError.
+
+        Returns:
+            True if the call is the half-open probe
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                remaining = self._remaining_open()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, "circuit open", remaining)
+                self._state = self.HALF_OPEN
+                logger.info(f"Circuit breaker {self.name} half-open, probing")
+
+            if self._state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, "probe in flight", 1.0)
+                self._probe_in_flight = True
+                return True
+
+            return False
+
+    def record_success(self, probe: bool) -> None:
+        with self._lock:
+            self._failures = 0
+            if probe and self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._probe_in_flight = False
+                logger.info(f"Circuit breaker {self.name} closed")
+
+    def record_failure(self, probe: bool) -> None:
+        with self._lock:
+            self._failures += 1
+            if probe and self._state == self.HALF_OPEN:
+                self._open()
+            elif (
+                self._state == self.CLOSED
+                and self._failures >= settings.BREAKER_FAILURE_THRESHOLD
+            ):
+                self._open()
+
+    def record_abandoned(self, probe: bool) -> None:
+        """The call was cancelled; neither a success nor a failure."""
+        if probe:
+            with self._lock:
+                self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "retry_after": (
+                    max(0.0, self._remaining_open()) if state == self.OPEN else 0.0
+                ),
+            }
+
+
+class Bulkhead:
+    """
+    Caps the calls in flight to one dependency.
+
+    Calls over the limit fail fast with BulkheadFullError instead of
+    queueing, so a hanging dependency ties up at most `max_concurrent`
+    threads and requests.
+    """
+
+    def __init__(self, name: str, max_concurrent: int) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def acquire(self) -> None:
+        """Take a slot or raise BulkheadFullError."""
+        with self._lock:
+            if self.in_flight >= self.max_concurrent:
+                self.rejected += 1
+                raise BulkheadFullError(self.name, "too many calls in flight", 1.0)
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def __enter__(self) -> "Bulkhead":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrent": self.max_concurrent,
+                "rejected": self.rejected,
+            }
+
+
+class Dependency:
+    """
+    Circuit breaker plus bulkhead around the calls to one remote service.
+
+    Usage from sync code (nothing here blocks):
+
+        with mongo_dependency.call():
+            collection.find_one(...)
+
+    From async code, run the blocking call in a worker thread with run(),
+    which holds the bulkhead slot until the thread is done and gives up
+    after `timeout` seconds:
+
+        cookie = await firebase_dependency.run(auth.create_session_cookie, token)
+
+    Exceptions listed in `ignored` are the caller's fault (e.g. an invalid
+    session cookie) and count as successful calls.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        ignored: tuple[type[BaseException], ...] = (),
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self.bulkhead = Bulkhead(name, max_concurrent)
+        self.ignored = ignored
+        self.timeout = timeout
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        with self.bulkhead:
+            with self._breaker_guard():
+                yield
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call in a worker thread, guarded like call().
+
+        The thread can't be interrupted, so its bulkhead slot is only given
+        back once it returns, even if the caller was cancelled or timed out
+        long before. A call still running after `timeout` seconds raises
+        DependencyTimeoutError and counts as a breaker failure.
+        """
+        self.bulkhead.acquire()
+        handed_off = False
+        try:
+            with self._breaker_guard():
+                ctx = contextvars.copy_context()
+                future = asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(ctx.run, func, *args, **kwargs)
+                )
+                future.add_done_callback(self._thread_done)
+                handed_off = True
+                try:
+                    # shield: timing out must not drop the future and its callback
+                    return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                except asyncio.TimeoutError:
+                    raise DependencyTimeoutError(self.name, self.timeout) from None
+        finally:
+            if not handed_off:
+                self.bulkhead.release()
+
+    def _thread_done(self, future: asyncio.Future) -> None:
+        self.bulkhead.release()
+        if not future.cancelled():
+            # Retrieved, so an abandoned call's error isn't logged as unhandled
+            future.exception()
+
+    @contextmanager
+    def _breaker_guard(self) -> Iterator[None]:
+        probe = self.breaker.before_call()
+        try:
+            yield
+        except self.ignored:
+            self.breaker.record_success(probe)
+            raise
+        except DependencyTimeoutError:
+            self.breaker.record_failure(probe)
+            raise
+        except DependencyUnavailableError:
+            # A nested guard rejected the call; this one wasn't attempted
+            self.breaker.record_abandoned(probe)
+            raise
+        except Exception:
+            self.breaker.record_failure(probe)
+            raise
+        except BaseException:
+            self.breaker.record_abandoned(probe)
+            raise
+        else:
+            self.breaker.record_success(probe)
+
+    def snapshot(self) -> dict:
+        return {
+            "breaker": self.breaker.snapshot(),
+            "bulkhead": self.bulkhead.snapshot(),
+        }
+
+
+mongo_dependency = Dependency(
+    "mongo",
+    settings.MONGO_MAX_CONCURRENCY,
+    ignored=(DuplicateKeyError,),
+)
+firebase_dependency = Dependency(
+    "firebase",
+    settings.FIREBASE_MAX_CONCURRENCY,
+    # Bad, expired or revoked credentials say nothing about Firebase's health
+    ignored=(
+        auth.InvalidIdTokenError,
+        auth.InvalidSessionCookieError,
+        auth.UserDisabledError,
+        auth.UserNotFoundError,
+        ValueError,
+    ),
+    timeout=settings.FIREBASE_CALL_TIMEOUT,
+)
+
+DEPENDENCIES = {dep.name: dep for dep in (mongo_dependency, firebase_dependency)}
@@ -0,0 +1,120 @@
+"""
+Fast JSON response classes.
+
+FastAPI's default path runs the returned value through `jsonable_encoder`
+and then stdlib `json.dumps`, which walks large payloads twice. These
+classes serialize straight to bytes instead and are opt-in per route:
+
+    @router.get("/results", response_model=ResultListResponse)
+    async def list_results(...):
+        docs = db.find_all_results_by_user(uid, settings.RESULT_COLLECTION)
+        return ModelJSONResponse(ResultListResponse(results=docs))
+
+    @router.get("/raw", response_class=FastJSONResponse)
+    async def get_raw(...):
+        return mongo_document  # ObjectId / datetime are fine
+
+    @router.get("/result/{task_id}", response_model=ResultResponse)
+    async def get_result(...):
+        doc = db.find_raw_result_by_task(uid, task_id, settings.RESULT_COLLECTION)
+        return RawResultResponse(doc)
+
+Returning a Response instance makes FastAPI skip its own encoding, so the
+response_model is only used for the OpenAPI schema.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+    logger.warning("orjson is not installed; JSON responses use the stdlib encoder")
+
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types that come out of MongoDB queries."""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, RawBSONDocument):
+        return bson.decode(obj.raw)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        # orjson encodes datetime natively; _default only sees ObjectId & co.
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that serializes with orjson and understands ObjectId/datetime."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    Response for an already-built Pydantic model.
+
+    Serializes with `model_dump_json`, which runs entirely in pydantic-core
+    without building an intermediate dict. Values inside `Any` fields that
+    pydantic can't encode (e.g. ObjectId) go through the same fallback as
+    FastJSONResponse.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(fallback=_default).encode("utf-8")
+
+
+# Top-level fields of a stored result that make up the TaskResult body
+RESULT_HEADER_FIELDS = ("user_id", "task_id", "timestamp", "original_query", "service")
+
+
+def raw_result_body(doc: RawBSONDocument) -> bytes:
+    """
+    Build a TaskResult JSON body straight from a raw result document.
+
+    Only the small header fields are decoded through RawBSONDocument. The
+    `external` subdocument is decoded from its BSON bytes once and written
+    out as `response`, without going through Pydantic validation.
+    """
+    header = {field: doc.get(field) for field in RESULT_HEADER_FIELDS}
+    if isinstance(header["timestamp"], datetime):
+        header["timestamp"] = header["timestamp"].isoformat()
+
+    payload = dumps(doc.get("external"))
+
+    # Splice the payload into the header object: '{...}' -> '{...,"response":...}'
+    return dumps(header)[:-1] + b',"response":' + payload + b"}"
+
+
+class RawResultResponse(JSONResponse):
+    """TaskResult response rendered directly from MongoDB.find_raw_result_by_task."""
+
+    def render(self, content: RawBSONDocument) -> bytes:
+        return raw_result_body(content)
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from typing import Any, Hashable, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from settings import settings
+from utils.firebase.firebase_manager import FirebaseTokenError, firebase_manager
+from utils.logger import get_logger
+from utils.redis.redis_manager import redis_manager
+from utils.resilience.dependency import DependencyUnavailableError
+from utils.responses import dumps
+
+logger = get_logger(__name__)
+
+FANOUT_CHANNEL = "ws:fanout"
+
+
+class SlowConsumerError(Exception):
+    """Raised when a connection can't keep up with its message rate."""
+
+    pass
+
+
+class Connection:
+    """
+    One accepted WebSocket and its outgoing message buffer.
+
+    Messages are buffered in insertion order. A message sent with a
+    coalescing key replaces a still-pending message with the same key
+    (e.g. only the latest progress of a task is worth sending), and
+    everything pending is flushed together as one frame. The buffer is
+    bounded; a client that lets it fill up is evicted.
+    """
+
+    __slots__ = ("websocket", "uid", "_pending", "_wakeup", "_sender", "closed")
+
+    def __init__(self, websocket: WebSocket, uid: str) -> None:
+        self.websocket = websocket
+        self.uid = uid
+        self._pending: dict[Hashable, dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def enqueue(self, message: dict[str, Any], key: Optional[Hashable] = None) -> None:
+        """
+        Buffer a message for sending.
+
+        Raises:
+            SlowConsumerError: If the buffer is full
+        """
+        if key is None:
+            key = object()
+        queue_full = len(self._pending) >= settings.WS_SEND_QUEUE_SIZE
+        if queue_full and key not in self._pending:
+            raise SlowConsumerError(f"Send queue full for user {self.uid}")
+        self._pending[key] = message
+        self._wakeup.set()
+
+    def start(self) -> None:
+        self._sender = asyncio.create_task(self._send_loop())
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                await self._wakeup.wait()
+                if settings.WS_BATCH_WINDOW:
+                    await asyncio.sleep(settings.WS_BATCH_WINDOW)
+                self._wakeup.clear()
+
+                batch = list(self._pending.values())
+                self._pending.clear()
+                if not batch:
+                    continue
+
+                payload = (
+                    batch[0]
+                    if len(batch) == 1
+                    else {
+                        "type": "batch",
+                        "messages": batch,
+                    }
+                )
+                await asyncio.wait_for(
+                    self.websocket.send_text(dumps(payload).decode("utf-8")),
+                    timeout=settings.WS_SEND_TIMEOUT,
+                )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"Send timed out for user {self.uid}, evicting")
+            await self.close(status.WS_1013_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.debug(f"Sender stopped for user {self.uid}: {e}")
+            self.closed = True
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._sender is not None and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            # Already closed by the peer
+            pass
+
+
+class ConnectionManager:
+    """
+    Registry of open WebSocket connections per Firebase uid.
+
+    Messages for a uid are delivered to this worker's connections directly
+    and, with WS_REDIS_FANOUT_ENABLED, published on Redis so the other
+    workers deliver them to theirs.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[str, set[Connection]] = defaultdict(set)
+        self._worker_id = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        # Closes of evicted connections, referenced until they finish
+        self._closing: set[asyncio.Task] = set()
+        self.evictions = 0
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(conns) for conns in self._connections.values())
+
+    # -------------------------------------------------
+    # Connection lifecycle
+    # -------------------------------------------------
+
+    async def authenticate(self, websocket: WebSocket) -> Optional[dict]:
+        """Verify the Firebase session cookie sent with the handshake."""
+        session_cookie = websocket.cookies.get("session")
+        if not session_cookie:
+            return None
+        try:
+            return await firebase_manager.verify_firebase_session_cookie(session_cookie)
+        except FirebaseTokenError as e:
+            logger.warning(f"WebSocket handshake rejected: {e}")
+            return None
+
+    async def connect(self, websocket: WebSocket) -> Optional[Connection]:
+        """
+        Authenticate and accept a WebSocket.
+
+        Returns None (after rejecting the handshake) if the session is invalid,
+        or cannot be verified right now (1013, so the client retries later).
+        """
+        try:
+            user_info = await self.authenticate(websocket)
+        except DependencyUnavailableError as e:
+            logger.warning(f"WebSocket handshake deferred: {e}")
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return None
+
+        if user_info is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return None
+
+        await websocket.accept()
+        conn = Connection(websocket, user_info["uid"])
+        conn.start()
+        self._connections[conn.uid].add(conn)
+        logger.debug(f"WebSocket connected for user {conn.uid}")
+        return conn
+
+    def _remove(self, conn: Connection) -> None:
+        conns = self._connections.get(conn.uid)
+        if conns is not None:
+            conns.discard(conn)
+            if not conns:
+                del self._connections[conn.uid]
+
+    async def disconnect(self, conn: Connection) -> None:
+        self._remove(conn)
+        await conn.close()
+        logger.debug(f"WebSocket disconnected for user {conn.uid}")
+
+    async def serve(self, conn: Connection) -> None:
+        """Keep the connection open until the client goes away."""
+        try:
+            while not conn.closed:
+                # Clients don't send anything meaningful; keep-alive is
+                # handled by the server's ping/pong
+                await conn.websocket.receive_text()
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: the socket was already closed from our side
+            pass
+        finally:
+            await self.disconnect(conn)
+
+    # -------------------------------------------------
+    # Sending
+    # -------------------------------------------------
+
+    def send_local(
+        self,
+        uid: str,
+        message: dict[str, Any],
+        key: Optional[Hashable] = None,
+    ) -> None:
+        """Deliver a message to uid's connections on this worker only."""
+        for conn in list(self._connections.get(uid, ())):
+            try:
+                conn.enqueue(message, key)
+            except SlowConsumerError as e:
+                logger.warning(f"{e}, evicting")
+                self.evictions += 1
+                # Unregister now so later messages don't hit it again
+                self._remove(conn)
+                task = asyncio.create_task(conn.close(status.WS_1013_TRY_AGAIN_LATER))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    async def send_to_user(
+        self,
+        uid: str,
+        message: dict[str, Any],
+        key: Optional[Hashable] = None,
+    ) -> None:
+        """Deliver a message to all of uid's connections across workers."""
+        self.send_local(uid, message, key)
+
+        if self._redis is not None:
+            envelope = {
+                "origin": self._worker_id,
+                "uid": uid,
+                "key": None if key is None else str(key),
+                "message": message,
+            }
+            try:
+                await self._redis.publish(FANOUT_CHANNEL, dumps(envelope))
+            except Exception as e:
+                logger.error(f"WebSocket fan-out publish failed: {e}")
+
+    # -------------------------------------------------
+    # Cross-worker fan-out
+    # -------------------------------------------------
+
+    async def start(self) -> None:
+        if not settings.WS_REDIS_FANOUT_ENABLED:
+            return
+        if not redis_manager.available:
+            logger.error("WS_REDIS_FANOUT_ENABLED is set but redis is not installed")
+            return
+
+        self._redis = redis_manager.get_client()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info("WebSocket Redis fan-out started")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(FANOUT_CHANNEL)
+                async for item in pubsub.listen():
+                    envelope = json.loads(item["data"])
+                    if envelope["origin"] == self._worker_id:
+                        continue
+                    if envelope["uid"] in self._connections:
+                        self.send_local(
+                            envelope["uid"], envelope["message"], envelope["key"]
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket fan-out listener failed: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def stop(self) -> None:
+        """Close every socket with 1001 (going away) and stop the fan-out."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        # The shared Redis client itself is closed by the app lifespan
+        self._redis = None
+
+        conns = [conn for conns in self._connections.values() for conn in conns]
+        await asyncio.gather(
+            *(conn.close(status.WS_1001_GOING_AWAY) for conn in conns),
+            *self._closing,
+            return_exceptions=True,
+        )
+        self._connections.clear()
+
+
+connection_manager = ConnectionManager()